@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+'''
+Deterministic synthetic Russian corpora and MWE lexicons for the benchmarks.
+
+The same parameters and seed always produce the same text, so results of different runs and revisions
+can be compared. Words are made of Russian syllables and drawn with a Zipf-like distribution, like the
+words of real text.
+'''
+import random
+
+from pyrusbasic.const import COMBINING_ACCENT_CHAR, COMMON_MWES, EM_DASH_CHAR, QUOTE_ANGLE_LEFT, QUOTE_ANGLE_RIGHT
+
+CONSONANTS = 'бвгджзклмнпрстфхцчшщ'
+VOWELS = 'аеиоуыэюяё'
+HYPHEN_PREFIXES = ('по', 'из', 'кое', 'во')
+HYPHEN_SUFFIXES = ('то', 'либо', 'нибудь', 'таки')
+SEPARATORS = (', ', '; ', ': ', ' ' + EM_DASH_CHAR + ' ', ' (', ') ')
+SENTENCE_ENDS = ('. ', '! ', '? ', '... ', '.\n\n')
+
+
+class CorpusProfile(object):
+    '''
+    Parameters of a synthetic corpus.
+    '''
+
+    def __init__(self, size=100000, stress_density=0.1, hyphen_rate=0.02, numeric_rate=0.02, punct_rate=0.1,
+                 mwe_rate=0.01, vocabulary_size=20000, seed=0):
+        '''
+        :param int size: number of characters
+        :param float stress_density: fraction of words with a stress mark
+        :param float hyphen_rate: fraction of words that are hyphenated
+        :param float numeric_rate: fraction of words that are numbers
+        :param float punct_rate: fraction of words followed by punctuation inside a sentence
+        :param float mwe_rate: fraction of words that are one of COMMON_MWES
+        :param int vocabulary_size: number of distinct generated words
+        :param int seed: random seed
+        '''
+        self.size = size
+        self.stress_density = stress_density
+        self.hyphen_rate = hyphen_rate
+        self.numeric_rate = numeric_rate
+        self.punct_rate = punct_rate
+        self.mwe_rate = mwe_rate
+        self.vocabulary_size = vocabulary_size
+        self.seed = seed
+
+    def replace(self, **kwargs):
+        '''
+        :return: a copy of the profile with some parameters changed
+        '''
+        params = dict(vars(self))
+        params.update(kwargs)
+        return CorpusProfile(**params)
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def make_word(rng):
+    '''
+    :param random.Random rng: random number generator
+    :return: a pseudo-word of one to four syllables
+    '''
+    return ''.join(rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(rng.randint(1, 4)))
+
+
+def make_vocabulary(size, seed=0):
+    '''
+    :param int size: number of words
+    :param int seed: random seed
+    :return: list of distinct pseudo-words
+    '''
+    rng = random.Random(seed)
+    words = []
+    seen = set()
+    while len(words) < size:
+        word = make_word(rng)
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def stress(word, rng):
+    '''
+    :return: the word with a stress mark after one of its vowels
+    '''
+    positions = [i for i, c in enumerate(word) if c in VOWELS]
+    if not positions:
+        return word
+    i = rng.choice(positions) + 1
+    return word[:i] + COMBINING_ACCENT_CHAR + word[i:]
+
+
+def generate_text(profile):
+    '''
+    Generates a text of sentences made of words, hyphenated words, numbers, multi-word expressions,
+    punctuation and paragraph breaks.
+
+    :param CorpusProfile profile: corpus parameters
+    :return: the text, exactly `profile.size` characters long
+    '''
+    rng = random.Random(profile.seed)
+    vocabulary = make_vocabulary(profile.vocabulary_size, profile.seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    parts = []
+    length = 0
+    sentence_start = True
+    while length < profile.size:
+        # Draw words in batches, choices() is much faster than one word at a time.
+        for word in rng.choices(vocabulary, weights, k=256):
+            roll = rng.random()
+            if roll < profile.numeric_rate:
+                if rng.random() < 0.7:
+                    word = str(rng.randint(0, 3000))
+                else:
+                    word = '%d,%d' % (rng.randint(0, 99), rng.randint(0, 9))
+            elif roll < profile.numeric_rate + profile.mwe_rate:
+                word = rng.choice(COMMON_MWES).lstrip(', ')
+            elif roll < profile.numeric_rate + profile.mwe_rate + profile.hyphen_rate:
+                if rng.random() < 0.5:
+                    word = rng.choice(HYPHEN_PREFIXES) + '-' + word
+                else:
+                    word = word + '-' + rng.choice(HYPHEN_SUFFIXES)
+            if rng.random() < profile.stress_density:
+                word = stress(word, rng)
+            if sentence_start:
+                word = word[0].upper() + word[1:]
+                sentence_start = False
+            roll = rng.random()
+            if roll < 0.08:
+                separator = rng.choice(SENTENCE_ENDS)
+                sentence_start = True
+            elif roll < 0.08 + profile.punct_rate:
+                separator = rng.choice(SEPARATORS)
+                if rng.random() < 0.1:
+                    word = QUOTE_ANGLE_LEFT + word + QUOTE_ANGLE_RIGHT
+            else:
+                separator = ' '
+            parts.append(word)
+            parts.append(separator)
+            length += len(word) + len(separator)
+    return ''.join(parts)[:profile.size]
+
+
+def split_documents(text, size):
+    '''
+    Splits a text into documents of about `size` characters, cut at spaces.
+
+    :return: list of strings
+    '''
+    documents = []
+    start = 0
+    while start < len(text):
+        end = text.find(' ', start + size)
+        if end < 0:
+            end = len(text)
+        documents.append(text[start:end])
+        start = end
+    return documents
+
+
+def generate_mwes(count, seed=0):
+    '''
+    Generates a lexicon of multi-word expressions: COMMON_MWES followed by expressions of two to four
+    generated words, some with a comma.
+
+    :param int count: number of expressions, at least len(COMMON_MWES)
+    :param int seed: random seed
+    :return: list of strings
+    '''
+    rng = random.Random(seed)
+    # The words of the corpus with the same seed, so that some expressions occur in the text.
+    vocabulary = make_vocabulary(max(1000, count // 10), seed)
+    mwes = list(COMMON_MWES)
+    seen = set(mwes)
+    while len(mwes) < count:
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(2, 4))]
+        separator = ', ' if rng.random() < 0.2 else ' '
+        mwe = words[0] + separator + ' '.join(words[1:])
+        if mwe not in seen:
+            seen.add(mwe)
+            mwes.append(mwe)
+    return mwes[:max(count, 0)]
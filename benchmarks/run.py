@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+'''
+Benchmarks of WordTokenizer on deterministic synthetic corpora.
+
+Each benchmark reports throughput, per-call latency percentiles and the peak memory allocated during one
+pass, and can be compared with the results of a previous run:
+
+    python benchmarks/run.py --output benchmarks/baseline.json
+    python benchmarks/run.py --baseline benchmarks/baseline.json
+
+The comparison exits with status 1 if any metric is worse than the baseline by more than the tolerance.
+'''
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyrusbasic import WordTokenizer  # noqa: E402
+from pyrusbasic.const import COMMON_MWES  # noqa: E402
+from corpus import CorpusProfile, generate_mwes, generate_text, split_documents  # noqa: E402
+
+BASE_PROFILE = CorpusProfile()
+LEXICON_SIZES = (('none', 0), ('common', len(COMMON_MWES)), ('10k', 10000), ('100k', 100000))
+DOCUMENT_SIZE = 1000
+
+# Metrics compared with the baseline, and whether a higher value is better.
+METRICS = (
+    ('throughput', True),
+    ('p50_ms', False),
+    ('p90_ms', False),
+    ('p99_ms', False),
+    ('peak_bytes', False),
+)
+
+_lexicons = {}
+_texts = {}
+
+
+def lexicon(name):
+    size = dict(LEXICON_SIZES)[name]
+    if name not in _lexicons:
+        _lexicons[name] = generate_mwes(size) if size else []
+    return _lexicons[name]
+
+
+def text(profile):
+    key = tuple(sorted(profile.as_dict().items()))
+    if key not in _texts:
+        _texts[key] = generate_text(profile)
+    return _texts[key]
+
+
+def percentile(values, p):
+    '''
+    :return: the nearest-rank percentile `p` (0-100) of the values
+    '''
+    values = sorted(values)
+    rank = max(0, min(len(values) - 1, int(round(p / 100.0 * len(values))) - 1))
+    return values[rank]
+
+
+def measure(calls, units, repeat):
+    '''
+    Times every call in `repeat` passes over the calls, then measures the peak memory of one more pass.
+
+    :param list calls: zero-argument functions making up one pass
+    :param int units: number of units (characters, expressions, words) processed by one pass
+    :param int repeat: number of timed passes
+    :return: dict of metrics
+    '''
+    latencies = []
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        elapsed = 0.0
+        for call in calls:
+            started = time.perf_counter()
+            call()
+            seconds = time.perf_counter() - started
+            latencies.append(seconds)
+            elapsed += seconds
+        best = elapsed if best is None else min(best, elapsed)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for call in calls:
+            call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'units': units,
+        'calls': len(calls),
+        'seconds': best,
+        'throughput': units / best if best else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p90_ms': percentile(latencies, 90) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'peak_bytes': peak,
+    }
+
+
+def tokenize_benchmarks(quick):
+    '''
+    Yields (name, calls, units) for tokenize(), varying one corpus parameter at a time from BASE_PROFILE.
+    '''
+    variants = [('size=%d' % size, {'size': size}) for size in ((10000, 100000) if quick else (10000, 100000, 1000000))]
+    variants += [('stress=%s' % density, {'stress_density': density}) for density in (0.0, 0.5)]
+    variants += [('hyphen=%s' % rate, {'hyphen_rate': rate}) for rate in (0.0, 0.2)]
+    variants += [('mix=sparse', {'numeric_rate': 0.0, 'punct_rate': 0.02}),
+                 ('mix=dense', {'numeric_rate': 0.1, 'punct_rate': 0.3})]
+    for name, params in variants:
+        tokenizer = WordTokenizer(mwes=lexicon('common'))
+        corpus = text(BASE_PROFILE.replace(**params))
+        yield 'tokenize/' + name, [lambda: tokenizer.tokenize(corpus)], len(corpus)
+
+    for name, _ in LEXICON_SIZES[:3] if quick else LEXICON_SIZES:
+        tokenizer = WordTokenizer(mwes=lexicon(name))
+        corpus = text(BASE_PROFILE)
+        yield 'tokenize/lexicon=%s' % name, [lambda: tokenizer.tokenize(corpus)], len(corpus)
+
+    tokenizer = WordTokenizer(mwes=lexicon('common'))
+    documents = split_documents(text(BASE_PROFILE), DOCUMENT_SIZE)
+    yield ('tokenize/documents=%d' % DOCUMENT_SIZE, [lambda d=d: tokenizer.tokenize(d) for d in documents],
+           sum(map(len, documents)))
+
+
+def add_mwes_benchmarks(quick):
+    '''
+    Yields (name, calls, units) for loading lexicons of each size into a new tokenizer.
+    '''
+    for name, _ in LEXICON_SIZES[1:3] if quick else LEXICON_SIZES[1:]:
+        mwes = lexicon(name)
+        yield 'add_mwes/lexicon=%s' % name, [lambda: WordTokenizer().add_mwes(mwes)], len(mwes)
+
+
+def unique_benchmarks(quick):
+    '''
+    Yields (name, calls, units) for WordList.unique(), ColumnarWordList.unique() and sorting the Word objects
+    of the base corpus.
+    '''
+    tokenizer = WordTokenizer(mwes=lexicon('common'))
+    corpus = text(BASE_PROFILE)
+    for name, compact in (('wordlist', False), ('columnar', True)):
+        wordlist = tokenizer.tokenize(corpus, compact=compact)
+        yield 'unique/%s' % name, [wordlist.unique], len(wordlist)
+    words = tokenizer.tokenize(corpus).words
+    yield 'sort/words', [lambda: sorted(words)], len(words)
+
+
+def compare(results, baseline, tolerance):
+    '''
+    :return: list of (name, metric, baseline value, value, change) for metrics worse than the baseline by
+             more than `tolerance`, as a fraction
+    '''
+    regressions = []
+    for name, metrics in sorted(results.items()):
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for metric, higher_is_better in METRICS:
+            if not old.get(metric):
+                continue
+            change = (metrics[metric] - old[metric]) / old[metric]
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append((name, metric, old[metric], metrics[metric], change))
+    return regressions
+
+
+def report(name, metrics, old=None):
+    line = '%-28s %12.0f/s %9.3f %9.3f %9.3f %9.1f' % (
+        name, metrics['throughput'], metrics['p50_ms'], metrics['p90_ms'], metrics['p99_ms'],
+        metrics['peak_bytes'] / 2.0 ** 20)
+    if old and old.get('throughput'):
+        line += ' %+8.1f%%' % ((metrics['throughput'] / old['throughput'] - 1) * 100)
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark WordTokenizer on synthetic Russian corpora.')
+    parser.add_argument('--quick', action='store_true', help='smaller corpora and lexicons, fewer passes')
+    parser.add_argument('--repeat', type=int, help='number of timed passes per benchmark (default 5, 3 with --quick)')
+    parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this string')
+    parser.add_argument('--output', help='write the results to this JSON file, e.g. to store a baseline')
+    parser.add_argument('--baseline', help='compare the results with this JSON file written by --output')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='fraction by which a metric may be worse than the baseline (default 0.2)')
+    args = parser.parse_args(argv)
+    repeat = args.repeat or (3 if args.quick else 5)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    print('%-28s %14s %9s %9s %9s %9s %9s' % ('benchmark', 'throughput', 'p50 ms', 'p90 ms', 'p99 ms', 'peak MB',
+                                              'vs base'))
+    results = {}
+    for benchmarks in (tokenize_benchmarks, add_mwes_benchmarks, unique_benchmarks):
+        for name, calls, units in benchmarks(args.quick):
+            if args.filter not in name:
+                continue
+            results[name] = measure(calls, units, repeat)
+            report(name, results[name], baseline.get(name))
+
+    if args.output:
+        data = {
+            'meta': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'quick': args.quick,
+                'repeat': repeat,
+                'corpus': BASE_PROFILE.as_dict(),
+            },
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        for name, metric, old, new, change in regressions:
+            print('REGRESSION %s %s: %.6g -> %.6g (%+.1f%%)' % (name, metric, old, new, change * 100))
+        if regressions:
+            return 1
+        print('No regressions beyond %.0f%% of the baseline.' % (args.tolerance * 100))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,2 +1 @@
-from .tokenizer import Word, WordList, WordTokenizer
-
+from .tokenizer import Word, WordList, ColumnarWordList, WordTokenizer
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import collections
+
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'entries', 'bytes', 'max_entries', 'max_bytes'])
+
+
+class LRUCache(object):
+    '''
+    Least recently used cache bounded by a number of entries and/or an approximate total size in bytes.
+    '''
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        '''
+        :param int max_entries: maximum number of entries (default unbounded)
+        :param int max_bytes: maximum total size of the entries in bytes (default unbounded)
+        '''
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+
+    def get(self, key):
+        '''
+        Returns the value stored for a key and marks it as most recently used.
+
+        :param key: a hashable key
+        :return: the value, or None if the key is not in the cache
+        '''
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, size=0):
+        '''
+        Stores a value, evicting the least recently used entries to stay within the limits. Values larger
+        than the byte limit are not stored.
+
+        :param key: a hashable key
+        :param value: the value to store
+        :param int size: approximate size of the entry in bytes
+        '''
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while ((self.max_entries is not None and len(self._entries) > self.max_entries) or
+               (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def clear(self):
+        '''
+        Removes all entries. The hit and miss counts are kept.
+        '''
+        self._entries.clear()
+        self._bytes = 0
+
+    def info(self):
+        '''
+        :return: CacheInfo with hit/miss counts, current size and limits
+        '''
+        return CacheInfo(self.hits, self.misses, len(self._entries), self._bytes, self.max_entries, self.max_bytes)
+
+    def __getstate__(self):
+        # Only the limits are copied, e.g. when a tokenizer is sent to worker processes.
+        return {'max_entries': self.max_entries, 'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return "LRUCache(%s)" % (self.info(),)
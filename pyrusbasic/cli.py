@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+'''
+Command-line tokenizer for large files and directories of text.
+
+    pyrusbasic corpus/ --mwes lexicon.txt --workers 8 --format binary -o corpus.bin
+
+Input files are memory-mapped and read in blocks that end at a line break. A pool of worker
+processes decodes each block, splits it at sentence ends (see `WordTokenizer.split()`) and tokenizes
+and formats the pieces. Only the first and last sentence of a block, which may continue in the
+neighbouring blocks, are sent back to the main process, which tokenizes them joined with the rest of
+those sentences.
+'''
+import argparse
+import array
+import collections
+import fnmatch
+import itertools
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+import time
+
+from .tokenizer import WordTokenizer, ENGINES, RE_SENTENCE_END, SPLIT_LENGTH
+
+FORMATS = ('jsonl', 'binary')
+BLOCK_SIZE = 1 << 22
+
+# Binary output: the header, then a file record before the pieces of each input file, each record
+# starting with its tag. A piece record holds the word count, the piece start offset in the normalized
+# text, the word types (one byte each), the UTF-8 byte length of each word and the UTF-8 text of the words.
+BINARY_MAGIC = b'PRBW'
+BINARY_VERSION = 1
+BINARY_FILE = b'F'
+BINARY_PIECE = b'P'
+
+# Tokenizer and output format installed in each worker process by _init_worker().
+_worker_tokenizer = None
+_worker_format = None
+
+
+def _init_worker(tokenizer, output_format):
+    global _worker_tokenizer, _worker_format
+    _worker_tokenizer = tokenizer
+    _worker_format = output_format
+
+
+def _format_words(tokenizer, output_format, text):
+    '''
+    Tokenizes a piece of normalized text and formats the words, without the path and start offset of
+    the piece, which only the main process knows (see `_piece_header()`).
+
+    :return: tuple of the output bytes and the number of words
+    '''
+    wordlist = tokenizer.tokenize(text, compact=True)
+    words = wordlist.strings()
+    if output_format == 'jsonl':
+        # The record without its opening brace, so that it follows the header as in one JSON object.
+        record = json.dumps({'words': words, 'types': wordlist.types.tolist()}, ensure_ascii=False)
+        return (record[1:] + '\n').encode('utf-8'), len(words)
+    encoded = [word.encode('utf-8') for word in words]
+    lengths = array.array('I', map(len, encoded))
+    if sys.byteorder == 'big':
+        lengths.byteswap()
+    return b''.join([wordlist.types.tobytes(), lengths.tobytes()] + encoded), len(words)
+
+
+def _piece_header(output_format, path, start, count):
+    if output_format == 'jsonl':
+        header = '{"path": %s, "start": %d, ' % (json.dumps(path, ensure_ascii=False), start)
+        return header.encode('utf-8')
+    return BINARY_PIECE + struct.pack('<IQ', count, start)
+
+
+def _format_piece(tokenizer, output_format, path, start, text):
+    '''
+    :return: tuple of the output bytes of a piece of normalized text and the number of words
+    '''
+    data, count = _format_words(tokenizer, output_format, text)
+    return _piece_header(output_format, path, start, count) + data, count
+
+
+def _format_block(tokenizer, output_format, data, encoding, piece_size):
+    '''
+    Decodes and normalizes a block of a file, splits it at sentence ends and tokenizes and formats
+    the sentences between the first and the last one, joined into pieces of at least `piece_size`
+    characters.
+
+    A cut at either end of the block depends on the text around the block: a sentence end that
+    starts the block may continue the last sentence of the previous block, and one that ends it may
+    continue into the next block. The first and last sentences are therefore returned as text, for
+    the main process to join with the neighbouring blocks.
+
+    :return: tuple of the first sentence, a list of (length, output bytes, word count) for each
+             piece, and the last sentence, or (text, [], None) if the block has no cut that does
+             not depend on its neighbours
+    '''
+    sentences = tokenizer.split(data.decode(encoding))
+    head = 2 if sentences and RE_SENTENCE_END.fullmatch(sentences[0]) else 1
+    if len(sentences) <= head:
+        return ''.join(sentences), [], None
+    pieces = []
+    piece = []
+    length = 0
+    for sentence in itertools.islice(sentences, head, len(sentences) - 1):
+        piece.append(sentence)
+        length += len(sentence)
+        if length >= piece_size:
+            pieces.append((length,) + _format_words(tokenizer, output_format, ''.join(piece)))
+            piece = []
+            length = 0
+    if piece:
+        pieces.append((length,) + _format_words(tokenizer, output_format, ''.join(piece)))
+    return ''.join(sentences[:head]), pieces, sentences[-1]
+
+
+def _worker_format_block(data, encoding, piece_size):
+    return _format_block(_worker_tokenizer, _worker_format, data, encoding, piece_size)
+
+
+def _file_record(path, output_format):
+    if output_format == 'jsonl':
+        return b''
+    encoded = path.encode('utf-8')
+    return BINARY_FILE + struct.pack('<I', len(encoded)) + encoded
+
+
+def read_binary(f):
+    '''
+    Reads the binary output of the command.
+
+    :param f: file-like object opened in binary mode
+    :return: generator of (path, start, words, types) for each piece, where `start` is the offset of the
+             piece in the normalized text of the file, `words` a list of strings and `types` an array of
+             word types
+    '''
+    header = f.read(len(BINARY_MAGIC) + 1)
+    if header[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+        raise ValueError("not a pyrusbasic word stream")
+    if header[-1] != BINARY_VERSION:
+        raise ValueError("unsupported word stream version: %d" % header[-1])
+    path = None
+    while True:
+        tag = f.read(1)
+        if not tag:
+            return
+        if tag == BINARY_FILE:
+            size, = struct.unpack('<I', f.read(4))
+            path = f.read(size).decode('utf-8')
+        elif tag == BINARY_PIECE:
+            count, start = struct.unpack('<IQ', f.read(12))
+            types = array.array('B', f.read(count))
+            lengths = array.array('I', f.read(4 * count))
+            if sys.byteorder == 'big':
+                lengths.byteswap()
+            data = f.read(sum(lengths))
+            words = []
+            offset = 0
+            for length in lengths:
+                words.append(data[offset:offset + length].decode('utf-8'))
+                offset += length
+            yield path, start, words, types
+        else:
+            raise ValueError("corrupt word stream: unknown record %r" % tag)
+
+
+def _input_files(inputs, pattern):
+    '''
+    :return: generator of the input paths, with directories replaced by the files in them that match the
+             pattern, recursively and in sorted order
+    '''
+    for path in inputs:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(fnmatch.filter(files, pattern)):
+                yield os.path.join(root, name)
+
+
+def _read_blocks(path, block_size):
+    '''
+    Reads a file in blocks of about `block_size` bytes that end at a line break, memory-mapping it unless
+    it is standard input.
+
+    :return: generator of bytes
+    '''
+    if path == '-':
+        stream = sys.stdin.buffer
+        pending = b''
+        for data in iter(lambda: stream.read(block_size), b''):
+            pending += data
+            cut = pending.rfind(b'\n') + 1
+            if cut > 0:
+                yield pending[:cut]
+                pending = pending[cut:]
+        if pending:
+            yield pending
+        return
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            start = 0
+            while start < size:
+                end = start + block_size
+                if end < size:
+                    # Cut after a line break: it is never inside a multi-byte character, and no combining
+                    # mark in the next block can attach to it.
+                    cut = mapped.rfind(b'\n', start, end)
+                    if cut < 0:
+                        cut = mapped.find(b'\n', end)
+                    end = size if cut < 0 else cut + 1
+                yield mapped[start:end]
+                start = end
+
+
+class Progress(object):
+    '''
+    Reports the bytes read and words written, and the throughput, on a stream.
+    '''
+
+    def __init__(self, stream=None, interval=1.0):
+        '''
+        :param stream: text stream to report on, or None to only count
+        :param float interval: minimum number of seconds between reports
+        '''
+        self.stream = stream
+        self.interval = interval
+        self.started = self.reported = time.perf_counter()
+        self.files = 0
+        self.bytes = 0
+        self.words = 0
+
+    def read(self, size):
+        self.bytes += size
+
+    def wrote(self, words):
+        self.words += words
+        now = time.perf_counter()
+        if self.stream is not None and now - self.reported >= self.interval:
+            self.reported = now
+            self.stream.write('\r%s' % self.summary(now))
+            self.stream.flush()
+
+    def summary(self, now=None):
+        seconds = max((now or time.perf_counter()) - self.started, 1e-9)
+        return '%d files, %.1f MB, %d words in %.1fs (%.1f MB/s, %d words/s)' % (
+            self.files, self.bytes / 1e6, self.words, seconds, self.bytes / 1e6 / seconds, self.words / seconds)
+
+    def finish(self):
+        if self.stream is not None:
+            self.stream.write('\r%s\n' % self.summary())
+            self.stream.flush()
+
+
+def _format_blocks(tokenizer, output_format, blocks, workers, encoding, piece_size):
+    '''
+    Formats blocks in order with a pool of worker processes (see `_format_block()`). At most a few
+    blocks per worker are in flight at a time, so that input is read only as fast as it is
+    processed.
+
+    :param blocks: iterable of (path, data) for each block of a file, or (path, None) at the start
+                   of a file
+    :return: generator of (path, result of `_format_block()` or None at the start of a file)
+    '''
+    if workers <= 1:
+        for path, data in blocks:
+            if data is None:
+                yield path, None
+            else:
+                yield path, _format_block(tokenizer, output_format, data, encoding, piece_size)
+        return
+    # multiprocessing.Pool rather than ProcessPoolExecutor, whose initializer needs Python 3.7.
+    with multiprocessing.Pool(workers, initializer=_init_worker,
+                              initargs=(tokenizer, output_format)) as pool:
+        def submit(block):
+            path, data = block
+            if data is None:
+                return path, None
+            return path, pool.apply_async(_worker_format_block, (data, encoding, piece_size))
+
+        blocks = iter(blocks)
+        pending = collections.deque(submit(block)
+                                    for block in itertools.islice(blocks, workers * 2))
+        while pending:
+            path, result = pending.popleft()
+            for block in itertools.islice(blocks, 1):
+                pending.append(submit(block))
+            yield path, None if result is None else result.get()
+
+
+def _format_all(tokenizer, output_format, blocks, workers, encoding, piece_size):
+    '''
+    Tokenizes and formats the blocks of all files. The last sentence of each block is carried over
+    and tokenized with the first sentence of the next block, since the next block may continue it.
+
+    :param blocks: iterable of (path, data) for each block of a file, or (path, None) at the start
+                   of a file
+    :return: generator of (bytes, word count), where the start offsets of the pieces are offsets in
+             the normalized text of the file
+    '''
+    path = None
+    start = 0
+    carry = ''
+    results = _format_blocks(tokenizer, output_format, blocks, workers, encoding, piece_size)
+    for block_path, result in results:
+        if result is None:
+            if carry:
+                yield _format_piece(tokenizer, output_format, path, start, carry)
+            path, start, carry = block_path, 0, ''
+            yield _file_record(path, output_format), 0
+            continue
+        head, pieces, tail = result
+        if tail is None:
+            carry += head
+            continue
+        yield _format_piece(tokenizer, output_format, path, start, carry + head)
+        start += len(carry) + len(head)
+        for length, data, count in pieces:
+            yield _piece_header(output_format, path, start, count) + data, count
+            start += length
+        carry = tail
+    if carry:
+        yield _format_piece(tokenizer, output_format, path, start, carry)
+
+
+def _blocks(files, block_size, progress):
+    '''
+    :return: generator of the blocks of all files, each file starting with (path, None)
+    '''
+    for path in files:
+        progress.files += 1
+        yield path, None
+        for data in _read_blocks(path, block_size):
+            progress.read(len(data))
+            yield path, data
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog='pyrusbasic',
+        description='Tokenize Russian text files into words, as JSON lines or a binary word stream.')
+    parser.add_argument('inputs', nargs='+', metavar='PATH',
+                        help='text files, directories of text files, or - for standard input')
+    parser.add_argument('-o', '--output', default='-', help='output file (default standard output)')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='jsonl',
+                        help='jsonl: one JSON object of words and types per piece of text; binary: a compact '
+                             'word stream, see read_binary() (default jsonl)')
+    parser.add_argument('--mwes', action='append', default=[], metavar='FILE',
+                        help='file of multi-word expressions, one per line (may be repeated)')
+    parser.add_argument('--lexicon', metavar='FILE', help='compiled lexicon written by WordTokenizer.save_lexicon()')
+    parser.add_argument('--case-sensitive', action='store_true', help='match the case of multi-word expressions')
+    parser.add_argument('--engine', choices=ENGINES, default='auto', help='character classification engine')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='number of worker processes, 1 tokenizes in this process (default: CPU count)')
+    parser.add_argument('--pattern', default='*.txt', help='file name pattern in directories (default *.txt)')
+    parser.add_argument('--encoding', default='utf-8', help='input encoding, compatible with ASCII (default utf-8)')
+    parser.add_argument('--piece-size', type=int, default=SPLIT_LENGTH,
+                        help='minimum number of characters in each piece of output (default %d)'
+                             % SPLIT_LENGTH)
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE,
+                        help='number of bytes read from a file and sent to a worker at a time '
+                             '(default %d)' % BLOCK_SIZE)
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not report progress on standard error')
+    return parser
+
+
+def make_tokenizer(args):
+    '''
+    :param argparse.Namespace args: parsed command-line arguments
+    :return: WordTokenizer with the lexicon and multi-word expressions of the arguments
+    '''
+    kwargs = {'engine': args.engine}
+    if args.lexicon:
+        kwargs['lexicon'] = args.lexicon
+    if args.case_sensitive or not args.lexicon:
+        kwargs['case_sensitive'] = args.case_sensitive
+    tokenizer = WordTokenizer(**kwargs)
+    for path in args.mwes:
+        with open(path, encoding=args.encoding) as f:
+            tokenizer.add_mwes(line.strip() for line in f if line.strip())
+    return tokenizer
+
+
+def main(argv=None):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    try:
+        tokenizer = make_tokenizer(args)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    progress = Progress(None if args.quiet else sys.stderr)
+    output = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+    try:
+        if args.format == 'binary':
+            output.write(BINARY_MAGIC + bytes([BINARY_VERSION]))
+        blocks = _blocks(_input_files(args.inputs, args.pattern), args.block_size, progress)
+        for data, words in _format_all(tokenizer, args.format, blocks, args.workers, args.encoding,
+                                       args.piece_size):
+            output.write(data)
+            progress.wrote(words)
+    except (OSError, UnicodeDecodeError) as e:
+        if progress.stream is not None:
+            progress.stream.write('\n')
+        parser.exit(1, '%s: error: %s\n' % (parser.prog, e))
+    finally:
+        output.flush()
+        if output is not sys.stdout.buffer:
+            output.close()
+    progress.finish()
+    return 0
@@ -63,6 +63,9 @@ QUOTE_ANGLE_RIGHT = '\u00BB'
 QUOTE_RAISED_LEFT = '\u201e'
 QUOTE_RAISED_RIGHT = '\u201c'
 
+# Punctuation that ends a sentence
+SENTENCE_END_PUNCT = '.!?'
+
 RUS_PUNCT = string.punctuation + QUOTE_ANGLE_LEFT + QUOTE_ANGLE_RIGHT + QUOTE_RAISED_LEFT + QUOTE_RAISED_RIGHT + EN_DASH_CHAR + EM_DASH_CHAR
 
 #------------------------------------------------
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+import array
+import collections
+import hashlib
+import itertools
+import unicodedata
+
+from .const import COMBINING_ACCENT_CHAR
+from .tokenizer import Word, ColumnarWordList
+
+RUSSIAN_WORD_TYPES = (Word.TYPE_WORD, Word.TYPE_HYPHENATED_WORD, Word.TYPE_MWE)
+
+
+def fold(text, case_sensitive=False, remove_accents=True):
+    '''
+    Returns the folded form of a word's text: stress marks removed, NFKC normalized and lowercased.
+
+    :param str text: the word text
+    :param bool case_sensitive: Preserve case (default False)
+    :param bool remove_accents: Remove stress marks (default True)
+    :return: the folded string
+    '''
+    if remove_accents:
+        text = text.replace(COMBINING_ACCENT_CHAR, '')
+    text = unicodedata.normalize('NFKC', text)
+    if not case_sensitive:
+        text = text.lower()
+    return text
+
+
+class _Folding(object):
+    '''
+    Counts the words of a batch by their folded form. Occurrences are first counted by their raw text, so
+    that each distinct string is folded (accents removed, NFKC normalized, lowercased) only once per batch.
+    '''
+
+    def __init__(self, case_sensitive=False, remove_accents=True, word_types=RUSSIAN_WORD_TYPES):
+        self.case_sensitive = case_sensitive
+        self.remove_accents = remove_accents
+        self.word_types = tuple(word_types)
+
+    def fold(self, text):
+        return fold(text, self.case_sensitive, self.remove_accents)
+
+    def count(self, words):
+        '''
+        :param words: a WordList, ColumnarWordList or iterable of Word objects
+        :return: Counter of folded terms
+        '''
+        if isinstance(words, ColumnarWordList):
+            table = bytearray(256)
+            for word_type in self.word_types:
+                table[word_type] = 1
+            mask = words.types.tobytes().translate(table)
+            text = words.text
+            raw = collections.Counter(text[start:end] for start, end in zip(itertools.compress(words.starts, mask),
+                                                                             itertools.compress(words.ends, mask)))
+        else:
+            if hasattr(words, 'words'):
+                words = words.words
+            word_types = self.word_types
+            raw = collections.Counter(w.source[w.start:w.end] if w._tokens is None else ''.join(w._tokens)
+                                      for w in words if w.word_type in word_types)
+        counts = collections.Counter()
+        for text, n in raw.items():
+            counts[self.fold(text)] += n
+        return counts
+
+    def settings(self):
+        return (self.case_sensitive, self.remove_accents, self.word_types)
+
+
+class FrequencyCounter(object):
+    '''
+    Term frequencies over any number of tokenized texts, folded by case and accents.
+
+    Counters built by different workers can be combined with `merge()`. With `max_terms` the counter keeps
+    a bounded summary of the most frequent terms (Misra-Gries): counts are underestimated by at most
+    total / (max_terms + 1), so every term more frequent than that is retained, and bounded counters merge
+    with the same guarantee.
+    '''
+
+    def __init__(self, case_sensitive=False, remove_accents=True, word_types=RUSSIAN_WORD_TYPES, max_terms=None):
+        '''
+        :param bool case_sensitive: Count terms that differ in case separately (default False)
+        :param bool remove_accents: Count terms that differ only in stress marks together (default True)
+        :param tuple word_types: Types of words to count (default russian words, hyphenated words and MWEs)
+        :param int max_terms: Keep only about this many terms (default None, exact counts)
+        '''
+        self._folding = _Folding(case_sensitive, remove_accents, word_types)
+        self.max_terms = max_terms
+        self.counts = collections.Counter()
+        self.total = 0
+
+    def update(self, words):
+        '''
+        Counts the words from a tokenization result.
+
+        :param words: a WordList, ColumnarWordList or iterable of Word objects
+        '''
+        batch = self._folding.count(words)
+        self.total += sum(batch.values())
+        self.counts.update(batch)
+        self._prune()
+
+    def merge(self, other):
+        '''
+        Adds the counts of another counter with the same settings, e.g. one built by another worker.
+
+        :param FrequencyCounter other: counter to merge
+        :return: self
+        '''
+        if self._folding.settings() != other._folding.settings():
+            raise ValueError("Cannot merge counters with different folding settings")
+        self.total += other.total
+        self.counts.update(other.counts)
+        if other.max_terms is not None and (self.max_terms is None or other.max_terms < self.max_terms):
+            self.max_terms = other.max_terms
+        self._prune()
+        return self
+
+    def _prune(self):
+        # Misra-Gries: let the table grow to twice its size, then subtract the count of the term just past
+        # the limit from every term and drop those that reach zero.
+        if self.max_terms is None or len(self.counts) <= 2 * self.max_terms:
+            return
+        ranked = self.counts.most_common()
+        threshold = ranked[self.max_terms][1]
+        self.counts = collections.Counter({term: n - threshold for term, n in ranked[:self.max_terms] if n > threshold})
+
+    def most_common(self, n=None):
+        '''
+        :param int n: number of terms to return (default all)
+        :return: list of (term, count) pairs, most frequent first
+        '''
+        return self.counts.most_common(n)
+
+    def __add__(self, other):
+        result = FrequencyCounter(*self._folding.settings(), max_terms=self.max_terms)
+        result.merge(self)
+        return result.merge(other)
+
+    def __getitem__(self, term):
+        return self.counts[term]
+
+    def __contains__(self, term):
+        return term in self.counts
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __repr__(self):
+        return "FrequencyCounter(%s,%s)" % (len(self.counts), self.total)
+
+
+class CountMinSketch(object):
+    '''
+    Approximate term frequencies in a fixed amount of memory, for vocabularies that do not fit in RAM.
+
+    Estimates never undercount, and overcount by at most about e / width * total with probability
+    1 - exp(-depth). Sketches with the same dimensions and settings are merged by adding their tables.
+    '''
+
+    def __init__(self, width=2 ** 18, depth=4, case_sensitive=False, remove_accents=True,
+                 word_types=RUSSIAN_WORD_TYPES):
+        '''
+        :param int width: Number of counters per row
+        :param int depth: Number of rows (hash functions), at most 8
+        :param bool case_sensitive: Count terms that differ in case separately (default False)
+        :param bool remove_accents: Count terms that differ only in stress marks together (default True)
+        :param tuple word_types: Types of words to count (default russian words, hyphenated words and MWEs)
+        '''
+        if not 1 <= depth <= 8:
+            raise ValueError("depth must be between 1 and 8")
+        self._folding = _Folding(case_sensitive, remove_accents, word_types)
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._table = array.array('Q', bytes(8 * width * depth))
+
+    def _cells(self, term):
+        digest = hashlib.blake2b(term.encode('utf-8'), digest_size=8 * self.depth).digest()
+        for row in range(self.depth):
+            yield row * self.width + int.from_bytes(digest[8 * row:8 * row + 8], 'little') % self.width
+
+    def add(self, term, count=1):
+        '''
+        :param str term: a folded term
+        :param int count: number of occurrences
+        '''
+        table = self._table
+        for cell in self._cells(term):
+            table[cell] += count
+        self.total += count
+
+    def update(self, words):
+        '''
+        Counts the words from a tokenization result.
+
+        :param words: a WordList, ColumnarWordList or iterable of Word objects
+        '''
+        for term, count in self._folding.count(words).items():
+            self.add(term, count)
+
+    def estimate(self, term):
+        '''
+        :param str term: a folded term
+        :return: estimated number of occurrences
+        '''
+        return min(self._table[cell] for cell in self._cells(term))
+
+    def merge(self, other):
+        '''
+        Adds the counts of another sketch with the same dimensions and settings.
+
+        :param CountMinSketch other: sketch to merge
+        :return: self
+        '''
+        if (self.width, self.depth, self._folding.settings()) != (other.width, other.depth, other._folding.settings()):
+            raise ValueError("Cannot merge sketches with different dimensions or settings")
+        table = self._table
+        for i, count in enumerate(other._table):
+            if count:
+                table[i] += count
+        self.total += other.total
+        return self
+
+    def __getitem__(self, term):
+        return self.estimate(term)
+
+    def __repr__(self):
+        return "CountMinSketch(%s,%s,%s)" % (self.width, self.depth, self.total)
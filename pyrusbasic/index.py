@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+import array
+import collections
+import json
+import mmap
+import os
+import struct
+import sys
+
+from .frequency import RUSSIAN_WORD_TYPES, fold
+from .tokenizer import WordTokenizer
+
+# Index file layout: the header, a UTF-8 JSON table with the document ids and, for each term, the offset
+# and number of its postings, then the postings as little-endian u32 triples of (document number, start,
+# end). Only the table is read when the file is opened; postings are sliced from a memory map on lookup.
+INDEX_MAGIC = b'PYRUSIDX'
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct('<8sHxxIQ')
+
+# An occurrence of a term: the document id and the offsets of the word in the normalized document text.
+Posting = collections.namedtuple('Posting', ['doc_id', 'start', 'end'])
+
+
+class ConcordanceIndex(object):
+    '''
+    Inverted index from the folded form of words (stress marks removed, lowercased) to their occurrences in
+    a collection of documents, for concordance queries that ignore stress marks and case.
+
+    Postings are recorded while each document is tokenized, in the same pass, and looking up a term is a
+    single dictionary access regardless of the size of the corpus.
+    '''
+
+    def __init__(self, tokenizer=None, word_types=RUSSIAN_WORD_TYPES):
+        '''
+        :param WordTokenizer tokenizer: tokenizer used to add documents (default a new WordTokenizer)
+        :param tuple word_types: types of words to index (default russian words, hyphenated words and MWEs)
+        '''
+        self.tokenizer = WordTokenizer() if tokenizer is None else tokenizer
+        self.word_types = frozenset(word_types)
+        self.docs = []
+        self._postings = {}
+        self._mmap = None
+        self._stored = {}
+        self._stored_offset = 0
+
+    def add(self, doc_id, text):
+        '''
+        Tokenizes a document and indexes its words.
+
+        :param doc_id: document identifier, must be JSON serializable to save the index
+        :param text: document text, a file-like object or an iterable of string chunks (see
+                     `WordTokenizer.tokenize_iter()`)
+        '''
+        self.add_words(doc_id, self.tokenizer.tokenize_iter(text))
+
+    def add_words(self, doc_id, words):
+        '''
+        Indexes the words of a document that has already been tokenized.
+
+        :param doc_id: document identifier, must be JSON serializable to save the index
+        :param words: a WordList or an iterable of Word objects with offsets
+        '''
+        if hasattr(words, 'words'):
+            words = words.words
+        doc_no = len(self.docs)
+        self.docs.append(doc_id)
+        postings = self._postings
+        word_types = self.word_types
+        for word in words:
+            if word.word_type not in word_types:
+                continue
+            term = word.gettext(remove_accents=True).lower()
+            entries = postings.get(term)
+            if entries is None:
+                entries = postings[term] = array.array('I')
+            entries.extend((doc_no, word.start, word.end))
+
+    def _term_postings(self, term):
+        entries = array.array('I')
+        stored = self._stored.get(term)
+        if stored is not None:
+            offset, count = stored
+            start = self._stored_offset + offset * 12
+            entries.frombytes(self._mmap[start:start + count * 12])
+            if sys.byteorder != 'little':
+                entries.byteswap()
+        if term in self._postings:
+            entries.extend(self._postings[term])
+        return entries
+
+    def lookup(self, query):
+        '''
+        Returns the occurrences of a word or multi-word expression, ignoring stress marks and case.
+
+        :param str query: the word to look up
+        :return: list of Posting(doc_id, start, end), in the order the documents were added
+        '''
+        entries = self._term_postings(fold(self.tokenizer._preprocess(query)))
+        docs = self.docs
+        return [Posting(docs[entries[i]], entries[i + 1], entries[i + 2]) for i in range(0, len(entries), 3)]
+
+    def count(self, query):
+        '''
+        Returns the number of occurrences of a word or multi-word expression.
+
+        :param str query: the word to look up
+        :return: number of occurrences
+        '''
+        term = fold(self.tokenizer._preprocess(query))
+        stored = self._stored.get(term)
+        return (0 if stored is None else stored[1]) + len(self._postings.get(term, ())) // 3
+
+    def terms(self):
+        '''
+        :return: set of all indexed terms
+        '''
+        return set(self._stored) | set(self._postings)
+
+    def save(self, path):
+        '''
+        Writes the index to a file that can be opened with `ConcordanceIndex.load()`.
+
+        :param str path: output file path
+        '''
+        table = {}
+        blob = array.array('I')
+        for term in sorted(self.terms()):
+            entries = self._term_postings(term)
+            table[term] = [len(blob) // 3, len(entries) // 3]
+            blob.extend(entries)
+        if sys.byteorder != 'little':
+            blob.byteswap()
+        header = json.dumps({'docs': self.docs, 'terms': table}, ensure_ascii=False).encode('utf-8')
+        # Write to a temporary file and rename it, so that a loaded index can be saved over its own file.
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(header), len(blob) // 3))
+            f.write(header)
+            f.write(blob.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, tokenizer=None, word_types=RUSSIAN_WORD_TYPES):
+        '''
+        Opens an index written by `save()`. Postings are read from a memory map only when they are looked up.
+        More documents can be added to the opened index.
+
+        :param str path: index file path
+        :param WordTokenizer tokenizer: tokenizer used to add documents (default a new WordTokenizer)
+        :param tuple word_types: types of words to index
+        :return: ConcordanceIndex instance
+        '''
+        index = cls(tokenizer=tokenizer, word_types=word_types)
+        with open(path, 'rb') as f:
+            index._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(index._mmap) < INDEX_HEADER.size:
+            raise ValueError("Not a concordance index: %s" % path)
+        magic, version, header_size, _ = INDEX_HEADER.unpack_from(index._mmap)
+        if magic != INDEX_MAGIC:
+            raise ValueError("Not a concordance index: %s" % path)
+        if version != INDEX_VERSION:
+            raise ValueError("Unsupported index version %s (expected %s): %s" % (version, INDEX_VERSION, path))
+        header = json.loads(index._mmap[INDEX_HEADER.size:INDEX_HEADER.size + header_size].decode('utf-8'))
+        index.docs = header['docs']
+        index._stored = {term: tuple(entry) for term, entry in header['terms'].items()}
+        index._stored_offset = INDEX_HEADER.size + header_size
+        return index
+
+    def close(self):
+        '''
+        Releases the memory map of a loaded index.
+        '''
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __contains__(self, query):
+        return self.count(query) > 0
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __repr__(self):
+        return "ConcordanceIndex(%s,%s)" % (len(self.docs), len(self._stored) + len(self._postings))
@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+import array
+import collections
+import mmap
+import struct
+import sys
+import unicodedata
+
+from .const import COMBINING_ACCENT_CHAR
+
+# Marker stored in a trie node to indicate that a multi-word expression ends there.
+# Token keys are always non-empty strings, so this can never collide with a child key.
+_TERMINAL = None
+
+# Summary of a bulk load of multi-word expressions.
+MWELoadResult = collections.namedtuple('MWELoadResult', ['added', 'duplicates', 'size', 'nodes', 'seconds'])
+
+# Compiled lexicon file layout. All integers are little-endian. The header is followed by these sections,
+# in order: key offsets (u32 * keys+1), node edge offsets (u32 * nodes+1), edge keys (u32 * edges),
+# edge children (u32 * edges), terminal flags (u8 * nodes) and the UTF-8 key blob. Keys are sorted by
+# their encoded bytes and the edges of each node are sorted by key id, so both can be binary searched.
+LEXICON_MAGIC = b'PYRUSMWE'
+LEXICON_VERSION = 1
+LEXICON_HEADER = struct.Struct('<8sHHIIIII')
+LEXICON_FLAG_CASE_SENSITIVE = 0x1
+
+# Maximum number of memoized token keys and key ids. Running text repeats the same words over and over,
+# so a bounded memo avoids normalizing the same token again at every occurrence.
+KEY_CACHE_SIZE = 65536
+
+
+class MWETrie(object):
+    '''
+    Token-level trie of multi-word expressions.
+
+    Each expression is stored as the sequence of its normalized tokens, so finding the longest expression
+    starting at a given position costs one dictionary lookup per token, no matter how many expressions
+    have been loaded.
+    '''
+
+    def __init__(self, case_sensitive=False):
+        '''
+        :param bool case_sensitive: Match case of MWEs (default False)
+        '''
+        self.case_sensitive = case_sensitive
+        self.max_length = 0
+        self._root = {}
+        self._size = 0
+        self._nodes = 1
+        self._keys = {}
+
+    def key(self, token):
+        '''
+        Returns the normalized form of a token used for matching: accents removed, NFKC normalized and
+        lowercased unless the trie is case sensitive.
+
+        :param str token: a token
+        :return: the normalized token
+        '''
+        key = self._keys.get(token)
+        if key is None:
+            key = unicodedata.normalize('NFKC', token.replace(COMBINING_ACCENT_CHAR, ''))
+            if not self.case_sensitive:
+                key = key.lower()
+            if len(self._keys) >= KEY_CACHE_SIZE:
+                self._keys.clear()
+            self._keys[token] = key
+        return key
+
+    def add(self, tokens):
+        '''
+        Adds a multi-word expression given as a list of tokens.
+
+        :param list tokens: the tokens of the expression
+        :return: True if the expression was added, False if it was already present
+        '''
+        if len(tokens) == 0:
+            return False
+        node = self._root
+        for token in tokens:
+            key = self.key(token)
+            child = node.get(key)
+            if child is None:
+                child = node[key] = {}
+                self._nodes += 1
+            node = child
+        if _TERMINAL in node:
+            return False
+        node[_TERMINAL] = True
+        self._size += 1
+        self.max_length = max(self.max_length, len(tokens))
+        return True
+
+    @property
+    def node_count(self):
+        '''
+        Number of nodes in the trie, including the root.
+        '''
+        return self._nodes
+
+    def starts_with(self, token):
+        '''
+        :param str token: a token
+        :return: True if some multi-word expression begins with the token
+        '''
+        return self.key(token) in self._root
+
+    def longest_match(self, prefix, tokens, start=0):
+        '''
+        Finds the longest multi-word expression that begins with the `prefix` tokens and continues with
+        the tokens following `start`.
+
+        :param list prefix: tokens already grouped in the word
+        :param tokens: indexable sequence of tokens that follow the word
+        :param int start: index of the first candidate token in `tokens`
+        :return: the number of tokens from `tokens` that complete the longest match, or 0 if none
+        '''
+        node = self._root
+        for token in prefix:
+            node = node.get(self.key(token))
+            if node is None:
+                return 0
+        found = 0
+        index = start
+        end = len(tokens)
+        while index < end:
+            node = node.get(self.key(tokens[index]))
+            if node is None:
+                break
+            index += 1
+            if _TERMINAL in node:
+                found = index - start
+        return found
+
+    def inner_keys(self):
+        '''
+        Returns the keys of the tokens that are followed by another token in some multi-word expression.
+        No expression continues across the end of a token whose key is not in this set.
+
+        :return: set of token keys
+        '''
+        keys = set()
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key is not _TERMINAL and len(child) > (_TERMINAL in child):
+                    keys.add(key)
+                    stack.append(child)
+        return keys
+
+    def save(self, path):
+        '''
+        Writes the trie to a compiled lexicon file that can be opened with `CompiledMWETrie.open()`.
+
+        :param str path: output file path
+        '''
+        keys = set()
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key is not _TERMINAL:
+                    keys.add(key.encode('utf-8'))
+                    stack.append(child)
+        keys = sorted(keys)
+        key_ids = {key.decode('utf-8'): i for i, key in enumerate(keys)}
+
+        # Number the nodes breadth first so that the root is node 0.
+        nodes = [self._root]
+        node_edges = array.array('I', [0])
+        edge_keys = array.array('I')
+        edge_children = array.array('I')
+        terminal = bytearray()
+        i = 0
+        while i < len(nodes):
+            node = nodes[i]
+            terminal.append(1 if _TERMINAL in node else 0)
+            edges = sorted((key_ids[key], child) for key, child in node.items() if key is not _TERMINAL)
+            for key_id, child in edges:
+                edge_keys.append(key_id)
+                edge_children.append(len(nodes))
+                nodes.append(child)
+            node_edges.append(len(edge_keys))
+            i += 1
+
+        key_offsets = array.array('I', [0])
+        for key in keys:
+            key_offsets.append(key_offsets[-1] + len(key))
+
+        flags = LEXICON_FLAG_CASE_SENSITIVE if self.case_sensitive else 0
+        header = LEXICON_HEADER.pack(LEXICON_MAGIC, LEXICON_VERSION, flags, self._size, self.max_length,
+                                     len(nodes), len(keys), len(edge_keys))
+        with open(path, 'wb') as f:
+            f.write(header)
+            for section in (key_offsets, node_edges, edge_keys, edge_children):
+                if sys.byteorder != 'little':
+                    section.byteswap()
+                f.write(section.tobytes())
+            f.write(bytes(terminal))
+            f.write(b''.join(keys))
+
+    def __getstate__(self):
+        # The memoized keys are not worth pickling, e.g. when the trie is sent to worker processes.
+        state = self.__dict__.copy()
+        state['_keys'] = {}
+        return state
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return "MWETrie(%s,%s)" % (self._size, self.case_sensitive)
+
+
+class CompiledMWETrie(object):
+    '''
+    Read-only trie of multi-word expressions backed by a memory-mapped compiled lexicon file.
+
+    The file is mapped read-only, so processes that open the same lexicon share a single copy of it in
+    the page cache and opening it does not depend on the size of the lexicon. Token keys are resolved by
+    binary search over the sorted key table and the results are memoized.
+    '''
+
+    def __init__(self, path):
+        '''
+        :param str path: path of a file written by `MWETrie.save()`
+        '''
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, flags, size, max_length, nodes, keys, edges) = self._validate()
+        except ValueError:
+            self._mmap.close()
+            raise
+        self.case_sensitive = bool(flags & LEXICON_FLAG_CASE_SENSITIVE)
+        self.max_length = max_length
+        self._size = size
+        self._node_count = nodes
+        self._key_count = keys
+        self._keys = {}
+        self._key_cache = {}
+
+        offset = LEXICON_HEADER.size
+        self._key_offsets, offset = self._u32_section(offset, keys + 1)
+        self._node_edges, offset = self._u32_section(offset, nodes + 1)
+        self._edge_keys, offset = self._u32_section(offset, edges)
+        self._edge_children, offset = self._u32_section(offset, edges)
+        self._terminal = memoryview(self._mmap)[offset:offset + nodes]
+        self._key_blob = offset + nodes
+
+    @classmethod
+    def open(cls, path):
+        '''
+        Opens a compiled lexicon file.
+
+        :param str path: path of a file written by `MWETrie.save()`
+        :return: CompiledMWETrie instance
+        '''
+        return cls(path)
+
+    def _validate(self):
+        '''
+        Checks the header and that the sections fill the file exactly, up to the end of the key
+        blob, so that a truncated file or one that is not a lexicon is rejected.
+
+        :return: the header fields
+        '''
+        if len(self._mmap) < LEXICON_HEADER.size:
+            raise ValueError("Not a compiled lexicon: %s" % self.path)
+        header = LEXICON_HEADER.unpack_from(self._mmap)
+        magic, version, _, _, _, nodes, keys, edges = header
+        if magic != LEXICON_MAGIC:
+            raise ValueError("Not a compiled lexicon: %s" % self.path)
+        if version != LEXICON_VERSION:
+            raise ValueError("Unsupported lexicon version %s (expected %s): %s"
+                             % (version, LEXICON_VERSION, self.path))
+        blob = LEXICON_HEADER.size + 4 * (keys + 1 + nodes + 1 + 2 * edges) + nodes
+        if len(self._mmap) < blob or len(self._mmap) != blob + struct.unpack_from(
+                '<I', self._mmap, LEXICON_HEADER.size + 4 * keys)[0]:
+            raise ValueError("Not a compiled lexicon or truncated: %s" % self.path)
+        return header
+
+    def _u32_section(self, offset, count):
+        end = offset + 4 * count
+        if sys.byteorder == 'little':
+            section = memoryview(self._mmap)[offset:end].cast('I')
+        else:
+            section = array.array('I', self._mmap[offset:end])
+            section.byteswap()
+        return section, end
+
+    key = MWETrie.key
+
+    def _key_id(self, key):
+        key_id = self._key_cache.get(key)
+        if key_id is not None:
+            return key_id
+        data = key.encode('utf-8')
+        offsets = self._key_offsets
+        blob = self._key_blob
+        lo, hi = 0, self._key_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._mmap[blob + offsets[mid]:blob + offsets[mid + 1]] < data:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._key_count and self._mmap[blob + offsets[lo]:blob + offsets[lo + 1]] == data:
+            key_id = lo
+        else:
+            key_id = -1
+        if len(self._key_cache) >= KEY_CACHE_SIZE:
+            self._key_cache.clear()
+        self._key_cache[key] = key_id
+        return key_id
+
+    def _child(self, node, key):
+        key_id = self._key_id(key)
+        if key_id < 0:
+            return -1
+        edge_keys = self._edge_keys
+        lo, hi = self._node_edges[node], self._node_edges[node + 1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if edge_keys[mid] < key_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._node_edges[node + 1] and edge_keys[lo] == key_id:
+            return self._edge_children[lo]
+        return -1
+
+    @property
+    def node_count(self):
+        '''
+        Number of nodes in the trie, including the root.
+        '''
+        return self._node_count
+
+    def starts_with(self, token):
+        '''
+        :param str token: a token
+        :return: True if some multi-word expression begins with the token
+        '''
+        return self._child(0, self.key(token)) >= 0
+
+    def longest_match(self, prefix, tokens, start=0):
+        '''
+        Finds the longest multi-word expression that begins with the `prefix` tokens and continues with
+        the tokens following `start` (see `MWETrie.longest_match()`).
+
+        :param list prefix: tokens already grouped in the word
+        :param tokens: indexable sequence of tokens that follow the word
+        :param int start: index of the first candidate token in `tokens`
+        :return: the number of tokens from `tokens` that complete the longest match, or 0 if none
+        '''
+        node = 0
+        for token in prefix:
+            node = self._child(node, self.key(token))
+            if node < 0:
+                return 0
+        found = 0
+        index = start
+        end = len(tokens)
+        while index < end:
+            node = self._child(node, self.key(tokens[index]))
+            if node < 0:
+                break
+            index += 1
+            if self._terminal[node]:
+                found = index - start
+        return found
+
+    def inner_keys(self):
+        '''
+        Returns the keys of the tokens that are followed by another token in some multi-word expression
+        (see `MWETrie.inner_keys()`).
+
+        :return: set of token keys
+        '''
+        node_edges = self._node_edges
+        key_ids = set(self._edge_keys[edge] for edge, child in enumerate(self._edge_children)
+                      if node_edges[child + 1] > node_edges[child])
+        blob = self._key_blob
+        offsets = self._key_offsets
+        return set(self._mmap[blob + offsets[i]:blob + offsets[i + 1]].decode('utf-8') for i in key_ids)
+
+    def to_trie(self):
+        '''
+        Returns a mutable copy of the lexicon.
+
+        :return: MWETrie instance
+        '''
+        trie = MWETrie(case_sensitive=self.case_sensitive)
+        trie._size = self._size
+        trie._nodes = self._node_count
+        trie.max_length = self.max_length
+        blob = self._key_blob
+        offsets = self._key_offsets
+        keys = [self._mmap[blob + offsets[i]:blob + offsets[i + 1]].decode('utf-8') for i in range(self._key_count)]
+        stack = [(0, trie._root)]
+        while stack:
+            node, target = stack.pop()
+            if self._terminal[node]:
+                target[_TERMINAL] = True
+            for edge in range(self._node_edges[node], self._node_edges[node + 1]):
+                child = target[keys[self._edge_keys[edge]]] = {}
+                stack.append((self._edge_children[edge], child))
+        return trie
+
+    def save(self, path):
+        '''
+        Writes the lexicon to another compiled lexicon file.
+
+        :param str path: output file path
+        '''
+        self.to_trie().save(path)
+
+    def close(self):
+        '''
+        Releases the memory map.
+        '''
+        for view in (self._key_offsets, self._node_edges, self._edge_keys, self._edge_children, self._terminal):
+            if isinstance(view, memoryview):
+                view.release()
+        self._mmap.close()
+
+    def __reduce__(self):
+        # Reopen the file rather than copying the mapping when pickled, e.g. when sent to a worker process.
+        return (self.__class__, (self.path,))
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return "CompiledMWETrie(%s,%s,%s)" % (self.path, self._size, self.case_sensitive)
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import collections
+import itertools
+import multiprocessing
+import os
+import queue
+
+# Tokenizer installed in each worker process by _init_worker().
+_worker_tokenizer = None
+
+
+def _init_worker(tokenizer):
+    global _worker_tokenizer
+    _worker_tokenizer = tokenizer
+
+
+def _tokenize_batch(tokenizer, start, texts):
+    '''
+    Tokenizes a batch of documents, catching errors so that one bad document does not fail the others.
+
+    :return: tuple of the batch start index and a list of (ok, WordList or exception) pairs
+    '''
+    results = []
+    for text in texts:
+        try:
+            results.append((True, tokenizer.tokenize(text)))
+        except Exception as e:
+            results.append((False, e))
+    return start, results
+
+
+def _worker_tokenize_batch(start, texts):
+    return _tokenize_batch(_worker_tokenizer, start, texts)
+
+
+def _batches(texts, size):
+    texts = iter(texts)
+    start = 0
+    while True:
+        batch = list(itertools.islice(texts, size))
+        if len(batch) == 0:
+            return
+        yield start, batch
+        start += len(batch)
+
+
+def _unpack(start, results, ordered, return_exceptions):
+    for offset, (ok, value) in enumerate(results):
+        if not ok and not return_exceptions:
+            raise value
+        if ordered:
+            yield value
+        else:
+            yield start + offset, value
+
+
+def tokenize_many(tokenizer, texts, workers=None, chunksize=64, ordered=True, return_exceptions=False):
+    '''
+    Tokenizes many independent documents with a pool of worker processes.
+
+    The tokenizer, including its multi-word expressions, is sent to each worker once when the pool starts
+    and documents are sent in batches of `chunksize`. At most a few batches per worker are in flight at a
+    time, so `texts` may be a lazy iterable of any length.
+
+    :param WordTokenizer tokenizer: the tokenizer to use
+    :param texts: iterable of strings
+    :param int workers: number of worker processes (default os.cpu_count()), 1 tokenizes in this process
+    :param int chunksize: number of documents sent to a worker at a time
+    :param bool ordered: yield WordLists in input order, otherwise yield (index, WordList) pairs as they complete
+    :param bool return_exceptions: yield the exception raised by a document in place of its WordList,
+                                   otherwise re-raise it
+    :return: generator of WordList objects or (index, WordList) pairs
+    '''
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    batches = _batches(texts, chunksize)
+    if workers <= 1:
+        for start, batch in batches:
+            yield from _unpack(*_tokenize_batch(tokenizer, start, batch), ordered, return_exceptions)
+        return
+
+    max_pending = workers * 4
+    # multiprocessing.Pool rather than ProcessPoolExecutor, whose initializer needs Python 3.7.
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(tokenizer,)) as pool:
+        if ordered:
+            pending = collections.deque(pool.apply_async(_worker_tokenize_batch, batch)
+                                        for batch in itertools.islice(batches, max_pending))
+            while pending:
+                start, results = pending.popleft().get()
+                for batch in itertools.islice(batches, 1):
+                    pending.append(pool.apply_async(_worker_tokenize_batch, batch))
+                yield from _unpack(start, results, ordered, return_exceptions)
+        else:
+            # Completed batches are put on a queue by the pool's result thread, in completion order.
+            done = queue.Queue()
+
+            def submit(batch):
+                pool.apply_async(_worker_tokenize_batch, batch,
+                                 callback=lambda result: done.put((True, result)),
+                                 error_callback=lambda error: done.put((False, error)))
+
+            pending = 0
+            for batch in itertools.islice(batches, max_pending):
+                submit(batch)
+                pending += 1
+            while pending:
+                ok, value = done.get()
+                pending -= 1
+                if not ok:
+                    raise value
+                for batch in itertools.islice(batches, 1):
+                    submit(batch)
+                    pending += 1
+                yield from _unpack(*value, ordered, return_exceptions)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import collections
+
+# Pipeline stages timed by a profiled WordTokenizer, in pipeline order, and what each counts:
+#   preprocess - normalized characters
+#   tokenize   - tokens
+#   assemble   - words grouped from the tokens (for the NumPy engine, tokenizing and grouping together)
+#   build      - words built as Word objects, columns or vocabulary ids
+#   cache      - texts found in the result cache (a hit counts 1, a miss 0)
+STAGES = ('preprocess', 'tokenize', 'assemble', 'build', 'cache')
+
+
+class TokenizerStats(object):
+    '''
+    Wall time and counts of each stage of the tokenizer pipeline, accumulated over all calls since the
+    last `reset()`.
+    '''
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        '''
+        Sets all timings and counts to zero.
+        '''
+        self.seconds = collections.Counter()
+        self.calls = collections.Counter()
+        self.counts = collections.Counter()
+        self.mwe_probes = 0
+        self.mwe_hits = 0
+
+    def record(self, stage, seconds, count):
+        '''
+        Adds one run of a stage.
+
+        :param str stage: the stage name, see STAGES
+        :param float seconds: wall time of the run
+        :param int count: number of items the run produced
+        '''
+        self.seconds[stage] += seconds
+        self.calls[stage] += 1
+        self.counts[stage] += count
+
+    @property
+    def characters(self):
+        return self.counts['preprocess']
+
+    @property
+    def tokens(self):
+        return self.counts['tokenize']
+
+    @property
+    def words(self):
+        return self.counts['assemble']
+
+    @property
+    def cache_hits(self):
+        return self.counts['cache']
+
+    @property
+    def cache_misses(self):
+        return self.calls['cache'] - self.counts['cache']
+
+    @property
+    def mwe_hit_rate(self):
+        '''
+        Fraction of multi-word expression lookups that matched an expression.
+        '''
+        return self.mwe_hits / self.mwe_probes if self.mwe_probes else 0.0
+
+    @property
+    def cache_hit_rate(self):
+        '''
+        Fraction of cached tokenizations that were found in the cache.
+        '''
+        return self.cache_hits / self.calls['cache'] if self.calls['cache'] else 0.0
+
+    def merge(self, other):
+        '''
+        Adds the timings and counts of another instance, e.g. one collected in another process.
+
+        :param TokenizerStats other: the stats to add
+        :return: self
+        '''
+        self.seconds.update(other.seconds)
+        self.calls.update(other.calls)
+        self.counts.update(other.counts)
+        self.mwe_probes += other.mwe_probes
+        self.mwe_hits += other.mwe_hits
+        return self
+
+    def as_dict(self):
+        '''
+        :return: dict of flat metric names to values, e.g. for a metrics system
+        '''
+        metrics = {}
+        for stage in STAGES:
+            metrics['%s.seconds' % stage] = self.seconds[stage]
+            metrics['%s.calls' % stage] = self.calls[stage]
+        metrics.update(
+            characters=self.characters,
+            tokens=self.tokens,
+            words=self.words,
+            mwe_probes=self.mwe_probes,
+            mwe_hits=self.mwe_hits,
+            mwe_hit_rate=self.mwe_hit_rate,
+            cache_hits=self.cache_hits,
+            cache_misses=self.cache_misses,
+            cache_hit_rate=self.cache_hit_rate,
+        )
+        return metrics
+
+    def __repr__(self):
+        return "TokenizerStats(%s)" % ', '.join('%s=%.6f' % (stage, self.seconds[stage]) for stage in STAGES)
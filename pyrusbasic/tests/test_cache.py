@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import pickle
+import unittest
+from pyrusbasic import WordTokenizer
+from pyrusbasic.cache import LRUCache
+
+TEXT = 'Несмотря на то, что чья-то карета...'
+
+class TestLRUCache(unittest.TestCase):
+    def test_entry_limit(self):
+        cache = LRUCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(1, cache.get('a'))
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(3, cache.get('c'))
+        self.assertEqual((3, 1, 2), cache.info()[:3])
+
+    def test_byte_limit(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put('a', 1, 6)
+        cache.put('b', 2, 6)
+        cache.put('c', 3, 11)
+        self.assertEqual([None, 2, None], [cache.get(k) for k in 'abc'])
+        self.assertEqual(6, cache.info().bytes)
+
+class TestTokenizerCache(unittest.TestCase):
+    def test_hits_return_new_wordlists(self):
+        tokenizer = WordTokenizer(cache_size=10)
+        first = tokenizer.tokenize(TEXT)
+        first.words[0].tokens.append('!')
+        first.words.pop()
+        second = tokenizer.tokenize(TEXT)
+        self.assertEqual(['Несмотря', ' ', 'на', ' ', 'то', ', ', 'что', ' ', 'чья-то', ' ', 'карета', '...'],
+                         [str(w) for w in second.words])
+        self.assertEqual((1, 1), tokenizer.cache_info()[:2])
+        compact = tokenizer.tokenize(TEXT, compact=True)
+        compact.types[0] = 0
+        self.assertEqual(1, tokenizer.tokenize(TEXT, compact=True).types[0])
+        self.assertEqual((2, 2), tokenizer.cache_info()[:2])
+
+    def test_invalidated_by_mwes(self):
+        tokenizer = WordTokenizer(cache_size=10)
+        self.assertEqual('Несмотря', str(tokenizer.tokenize(TEXT).words[0]))
+        tokenizer.add_mwe('несмотря на то, что')
+        self.assertEqual('Несмотря на то, что', str(tokenizer.tokenize(TEXT).words[0]))
+        tokenizer.add_mwes(['чья-то карета'])
+        self.assertEqual('чья-то карета', str(tokenizer.tokenize(TEXT).words[2]))
+        self.assertEqual(0, tokenizer.cache_info().hits)
+
+    def test_disabled(self):
+        tokenizer = WordTokenizer()
+        tokenizer.tokenize(TEXT)
+        self.assertIsNone(tokenizer.cache_info())
+
+    def test_pickle_drops_entries(self):
+        tokenizer = WordTokenizer(cache_size=10, cache_bytes=1000)
+        tokenizer.tokenize(TEXT)
+        info = pickle.loads(pickle.dumps(tokenizer)).cache_info()
+        self.assertEqual((0, 0, 0, 0, 10, 1000), tuple(info))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import collections
+import json
+import os
+import tempfile
+import unittest
+from pyrusbasic import WordTokenizer
+from pyrusbasic.cli import main, read_binary
+
+TEXT = ('Несмотря на то, что еще не много времени прошло с тех пор, как князь Андрей оставил Россию, '
+        'он много изменился за это время.\nЧья-то карета... Все счастливые семьи похожи друг на друга!\n\n'
+        'НАСА, высота 82,7 км. Мото́р заглох.\n') * 20
+MWES = ['Несмотря на то, что', 'еще не много', 'друг на друга']
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        os.makedirs(self.path('corpus', 'sub'))
+        for name, text in (('a.txt', TEXT), (os.path.join('sub', 'b.txt'), TEXT[:500]), ('c.md', TEXT)):
+            with open(self.path('corpus', name), 'w', encoding='utf-8') as f:
+                f.write(text)
+        with open(self.path('mwes.txt'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(MWES) + '\n')
+        self.tokenizer = tokenizer = WordTokenizer(mwes=MWES)
+        self.expected = {}
+        for name, text in (('a.txt', TEXT), (os.path.join('sub', 'b.txt'), TEXT[:500])):
+            wordlist = tokenizer.tokenize(text, compact=True)
+            self.expected[self.path('corpus', name)] = (wordlist.strings(), wordlist.types.tolist())
+
+    def path(self, *names):
+        return os.path.join(self.dir.name, *names)
+
+    def run_main(self, *args):
+        argv = [self.path('corpus'), '--mwes', self.path('mwes.txt'), '-q', '--block-size', '300',
+                '--piece-size', '200'] + list(args)
+        self.assertEqual(0, main(argv))
+
+    def test_jsonl(self):
+        outputs = []
+        for workers in ('1', '2'):
+            self.run_main('-o', self.path('out.jsonl'), '-w', workers)
+            results = collections.defaultdict(lambda: ([], []))
+            with open(self.path('out.jsonl'), encoding='utf-8') as f:
+                outputs.append(f.read())
+            records = [json.loads(line) for line in outputs[-1].splitlines()]
+            for record in records:
+                results[record['path']][0].extend(record['words'])
+                results[record['path']][1].extend(record['types'])
+            self.assertEqual(self.expected, dict(results))
+            self.assertEqual(0, records[0]['start'])
+            self.assertLess(records[0]['start'], records[1]['start'])
+        self.assertEqual(outputs[0], outputs[1])
+
+        # Each piece starts at its offset in the normalized text of the file.
+        text = self.tokenizer.tokenize(TEXT).text
+        records = [record for record in records if record['path'] == self.path('corpus', 'a.txt')]
+        for record, end in zip(records, [r['start'] for r in records[1:]] + [len(text)]):
+            wordlist = self.tokenizer.tokenize(text[record['start']:end], compact=True)
+            self.assertEqual(record['words'], wordlist.strings())
+
+    def test_binary(self):
+        self.run_main('-o', self.path('out.bin'), '-f', 'binary', '-w', '1')
+        results = collections.defaultdict(lambda: ([], []))
+        with open(self.path('out.bin'), 'rb') as f:
+            for path, start, words, types in read_binary(f):
+                results[path][0].extend(words)
+                results[path][1].extend(types)
+        self.assertEqual(self.expected, dict(results))
+
+        with open(self.path('mwes.txt'), 'rb') as f:
+            with self.assertRaises(ValueError):
+                list(read_binary(f))
+
+    def test_missing_file(self):
+        with self.assertRaises(SystemExit):
+            main([self.path('missing.txt'), '-q', '-o', self.path('out.jsonl')])
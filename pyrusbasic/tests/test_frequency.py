@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import pickle
+import unittest
+from pyrusbasic import Word, WordTokenizer
+from pyrusbasic.frequency import FrequencyCounter, CountMinSketch
+
+TEXTS = [
+    'Мото́р, мотор и Мотор. Несмотря на то, что по-русски.',
+    'мотор по-ру́сски, несмотря на то, что 42',
+]
+
+class TestFrequencyCounter(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = WordTokenizer(mwes=['несмотря на то, что'])
+
+    def test_folding(self):
+        counter = FrequencyCounter()
+        counter.update(self.tokenizer.tokenize(TEXTS[0]))
+        words = self.tokenizer.tokenize(TEXTS[1], compact=True).words
+        counter.update(words)
+        self.assertTrue(all(w._tokens is None for w in words))
+        self.assertEqual(4, counter['мотор'])
+        self.assertEqual(2, counter['по-русски'])
+        self.assertEqual(2, counter['несмотря на то, что'])
+        self.assertEqual(9, counter.total)
+        self.assertNotIn('42', counter)
+
+        exact = FrequencyCounter(case_sensitive=True, remove_accents=False)
+        exact.update(self.tokenizer.tokenize(TEXTS[0], compact=True))
+        self.assertEqual([('Мото́р', 1), ('мотор', 1), ('Мотор', 1)],
+                         [(t, n) for t, n in exact.most_common() if 'ото' in t])
+
+    def test_word_types(self):
+        counter = FrequencyCounter(word_types=[Word.TYPE_NUMERIC])
+        counter.update(self.tokenizer.tokenize(TEXTS[1]))
+        self.assertEqual([('42', 1)], counter.most_common())
+
+    def test_merge(self):
+        parts = []
+        for text in TEXTS:
+            counter = FrequencyCounter()
+            counter.update(self.tokenizer.tokenize(text))
+            parts.append(pickle.loads(pickle.dumps(counter)))
+        combined = FrequencyCounter()
+        for text in TEXTS:
+            combined.update(self.tokenizer.tokenize(text))
+        self.assertEqual(combined.counts, (parts[0] + parts[1]).counts)
+        with self.assertRaises(ValueError):
+            parts[0].merge(FrequencyCounter(case_sensitive=True))
+
+    def test_bounded(self):
+        words = [Word('частое', Word.TYPE_WORD)] * 50 + [Word('редкое%s' % chr(0x430 + i % 32), Word.TYPE_WORD) for i in range(40)]
+        counter = FrequencyCounter(max_terms=3)
+        for i in range(0, len(words), 10):
+            counter.update(words[i:i + 10])
+        self.assertLessEqual(len(counter), 6)
+        self.assertEqual('частое', counter.most_common(1)[0][0])
+        self.assertGreaterEqual(counter['частое'], 50 - counter.total // 4)
+
+class TestCountMinSketch(unittest.TestCase):
+    def test_estimates(self):
+        tokenizer = WordTokenizer()
+        a = CountMinSketch(width=1024, depth=4)
+        b = CountMinSketch(width=1024, depth=4)
+        a.update(tokenizer.tokenize(TEXTS[0]))
+        b.update(tokenizer.tokenize(TEXTS[1]))
+        a.merge(b)
+        self.assertGreaterEqual(a['мотор'], 4)
+        self.assertLessEqual(a['мотор'], a.total)
+        self.assertEqual(0, CountMinSketch(width=16, depth=2)['мотор'])
+        with self.assertRaises(ValueError):
+            a.merge(CountMinSketch(width=512, depth=4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+from pyrusbasic import WordTokenizer
+from pyrusbasic.const import COMMON_MWES
+
+TEXT = (
+    'Несмотря на то, что еще не много времени прошло с тех пор, как князь Андре́й оставил Россию, '
+    'он много изменился за это время. Жила́-была́ на све́те лягу́шка-кваку́шка. НАСА, высота 82,7 км. '
+    'Он любил её не потому, что она обладала неземной красотой.\n\n'
+) * 3
+
+EDITS = ['', 'а', ' ', ', ', '-', 'то', ' что ', 'несмотря на', '7', '́', '.\n']
+
+class TestRetokenize(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = WordTokenizer(mwes=COMMON_MWES)
+
+    def words(self, wordlist):
+        return [(w.tokens, w.word_type, w.start, w.end) for w in wordlist.words]
+
+    def check_edit(self, compact, offset, removed, inserted):
+        previous = self.tokenizer.tokenize(TEXT, compact=compact)
+        old_words = self.words(previous)
+        text = previous.text
+        updated, changed = self.tokenizer.retokenize(previous, offset, removed, inserted)
+        expected = self.tokenizer.tokenize(text[:offset] + inserted + text[offset + removed:], compact=compact)
+        self.assertEqual(expected.text, updated.text)
+        new_words = self.words(updated)
+        self.assertEqual(self.words(expected), new_words, (offset, removed, inserted))
+        self.assertEqual(old_words[:changed.start], new_words[:changed.start])
+        self.assertEqual(len(old_words) - changed.old_stop, len(new_words) - changed.new_stop)
+        self.assertLessEqual(changed.old_stop - changed.start, 30)
+
+    def test_random_edits(self):
+        rng = random.Random(7)
+        length = len(self.tokenizer.tokenize(TEXT).text)
+        for compact in (False, True):
+            for _ in range(100):
+                offset = rng.randint(0, length)
+                removed = rng.randint(0, min(5, length - offset))
+                self.check_edit(compact, offset, removed, rng.choice(EDITS))
+
+    def test_chained_edits(self):
+        # Offsets are shifted lazily between edits, so apply many edits to the same result, only sometimes
+        # looking at the words in between.
+        rng = random.Random(11)
+        for compact in (False, True):
+            wordlist = self.tokenizer.tokenize(TEXT, compact=compact)
+            for i in range(200):
+                length = len(wordlist.text)
+                offset = rng.randint(0, length) if i % 10 == 0 else min(length, max(0, offset + rng.randint(-40, 40)))
+                removed = rng.randint(0, min(5, length - offset))
+                wordlist, _ = self.tokenizer.retokenize(wordlist, offset, removed, rng.choice(EDITS))
+                if i % 7 == 0:
+                    expected = self.tokenizer.tokenize(wordlist.text, compact=compact)
+                    self.assertEqual(self.words(expected), self.words(wordlist))
+            expected = self.tokenizer.tokenize(wordlist.text, compact=compact)
+            self.assertEqual(self.words(expected), self.words(wordlist))
+            self.assertEqual(len(expected), len(wordlist))
+
+    def test_edits_at_ends(self):
+        length = len(self.tokenizer.tokenize(TEXT).text)
+        self.check_edit(False, 0, 0, 'Да, ')
+        self.check_edit(False, length, 0, ' Конец')
+        self.check_edit(False, length - 5, 5, '')
+
+    def test_invalid_edit(self):
+        wordlist = self.tokenizer.tokenize('да нет')
+        with self.assertRaises(ValueError):
+            self.tokenizer.retokenize(wordlist, 4, 10, '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import tempfile
+import unittest
+from pyrusbasic import WordTokenizer
+from pyrusbasic.index import ConcordanceIndex, Posting
+
+DOCS = {
+    'a': 'Мото́р заглох. Несмотря на то, что мотор новый.',
+    'b': 'МОТОР и по-ру́сски, несмотря на то, что',
+}
+
+class TestConcordanceIndex(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = WordTokenizer(mwes=['несмотря на то, что'])
+        self.index = ConcordanceIndex(self.tokenizer)
+        self.index.add('a', DOCS['a'])
+        self.index.add_words('b', self.tokenizer.tokenize(DOCS['b'], compact=True).words)
+
+    def test_lookup(self):
+        postings = self.index.lookup('мотор')
+        self.assertEqual(['a', 'a', 'b'], [p.doc_id for p in postings])
+        texts = {doc_id: self.tokenizer.tokenize(text).text for doc_id, text in DOCS.items()}
+        self.assertEqual(['Мото́р', 'мотор', 'МОТОР'], [texts[p.doc_id][p.start:p.end] for p in postings])
+        self.assertEqual(postings, self.index.lookup('МОТО́Р'))
+        self.assertEqual(2, self.index.count('Несмотря на то, что'))
+        self.assertEqual([Posting('b', 8, 18)], self.index.lookup('по-русски'))
+        self.assertEqual([], self.index.lookup('заглохло'))
+        self.assertNotIn('и', ConcordanceIndex(word_types=[]))
+
+    def test_stream(self):
+        index = ConcordanceIndex(self.tokenizer)
+        index.add(1, io.StringIO(DOCS['a'] * 100))
+        self.assertEqual(200, index.count('мотор'))
+
+    def test_save_and_load(self):
+        fd, path = tempfile.mkstemp(suffix='.idx')
+        os.close(fd)
+        try:
+            self.index.save(path)
+            loaded = ConcordanceIndex.load(path, tokenizer=self.tokenizer)
+            self.assertEqual(['a', 'b'], loaded.docs)
+            self.assertEqual(self.index.terms(), loaded.terms())
+            for term in self.index.terms():
+                self.assertEqual(self.index.lookup(term), loaded.lookup(term))
+            loaded.add('c', 'мотор')
+            self.assertEqual(['a', 'a', 'b', 'c'], [p.doc_id for p in loaded.lookup('мотор')])
+            loaded.save(path)
+            self.assertEqual(4, ConcordanceIndex.load(path).count('мотор'))
+            loaded.close()
+        finally:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
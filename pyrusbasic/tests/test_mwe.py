@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import mmap
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+from pyrusbasic import WordTokenizer
+from pyrusbasic.const import COMMON_MWES
+from pyrusbasic.mwe import MWETrie, CompiledMWETrie
+
+real_mmap = mmap.mmap
+
+class TestMWETrie(unittest.TestCase):
+    def test_longest_match(self):
+        trie = MWETrie()
+        trie.add(['до', ' ', 'того'])
+        trie.add(['до', ' ', 'того', ' ', 'как'])
+        self.assertEqual(2, len(trie))
+        self.assertEqual(5, trie.max_length)
+        self.assertEqual(4, trie.longest_match(['до'], [' ', 'того', ' ', 'как', '.']))
+        self.assertEqual(2, trie.longest_match(['До'], [' ', 'того', ' ', 'же']))
+        self.assertEqual(0, trie.longest_match(['до'], [' ', 'тех']))
+        self.assertEqual(0, trie.longest_match(['после'], [' ', 'того']))
+        self.assertTrue(trie.starts_with('До'))
+        self.assertFalse(trie.starts_with('того'))
+        self.assertEqual({'до', ' ', 'того'}, trie.inner_keys())
+
+    def test_duplicates(self):
+        trie = MWETrie()
+        self.assertTrue(trie.add(['в', ' ', 'течение']))
+        self.assertFalse(trie.add(['В', ' ', 'течение']))
+        self.assertEqual(1, len(trie))
+
+    def test_case_sensitive(self):
+        trie = MWETrie(case_sensitive=True)
+        trie.add(['Несмотря', ' ', 'на'])
+        self.assertEqual(2, trie.longest_match(['Несмотря'], [' ', 'на']))
+        self.assertEqual(0, trie.longest_match(['несмотря'], [' ', 'на']))
+
+class TestTokenizerMWEs(unittest.TestCase):
+    def test_accented_text_matches_mwe(self):
+        tokenizer = WordTokenizer()
+        tokenizer.add_mwe('в течение')
+        wordlist = tokenizer.tokenize('в тече́ние го́да')
+        self.assertEqual(['в тече́ние', ' ', 'го́да'], [str(w) for w in wordlist.words])
+
+    def test_hyphenated_mwe(self):
+        tokenizer = WordTokenizer()
+        tokenizer.add_mwe('из-за того, что')
+        wordlist = tokenizer.tokenize('Из-за того, что шёл дождь.')
+        self.assertEqual('Из-за того, что', str(wordlist.words[0]))
+        self.assertEqual(7, wordlist.words[0].count())
+
+    def test_bulk_load(self):
+        tokenizer = WordTokenizer()
+        result = tokenizer.add_mwes(['в течение', 'В течение', 'несмотря на', 'несмотря на то, что'])
+        self.assertEqual(3, result.added)
+        self.assertEqual(1, result.duplicates)
+        self.assertEqual(3, result.size)
+        self.assertEqual(3, tokenizer.add_mwes(['в течение']).size)
+
+    def test_constructor_mwes(self):
+        tokenizer = WordTokenizer(mwes=['потому, что'])
+        wordlist = tokenizer.tokenize('Потому, что надо.')
+        self.assertEqual('Потому, что', str(wordlist.words[0]))
+
+class TestCompiledLexicon(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.mwe')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_roundtrip(self):
+        tokenizer = WordTokenizer(mwes=COMMON_MWES)
+        tokenizer.add_mwes(['из-за того, что', 'в течение'])
+        tokenizer.save_lexicon(self.path)
+        compiled = WordTokenizer.from_lexicon(self.path)
+        self.assertIsInstance(compiled._mwe_trie, CompiledMWETrie)
+        self.assertEqual(len(tokenizer._mwe_trie), len(compiled._mwe_trie))
+        self.assertEqual(tokenizer._mwe_trie.max_length, compiled._mwe_trie.max_length)
+        self.assertTrue(compiled._mwe_trie.starts_with('В'))
+        self.assertFalse(compiled._mwe_trie.starts_with('течение'))
+        self.assertEqual(tokenizer._mwe_trie.inner_keys(), compiled._mwe_trie.inner_keys())
+        text = 'Из-за того, что шёл дождь, мы остались дома, несмотря на то, что в тече́ние дня было тепло.'
+        expected = [str(w) for w in tokenizer.tokenize(text).words]
+        self.assertEqual(expected, [str(w) for w in compiled.tokenize(text).words])
+        self.assertEqual(expected, [str(w) for w in pickle.loads(pickle.dumps(compiled)).tokenize(text).words])
+
+    def test_settings(self):
+        WordTokenizer(case_sensitive=True, mwes=['Несмотря на']).save_lexicon(self.path)
+        tokenizer = WordTokenizer(lexicon=self.path)
+        self.assertTrue(tokenizer._case_sensitive)
+        self.assertEqual('Несмотря на', str(tokenizer.tokenize('Несмотря на это').words[0]))
+        self.assertEqual('несмотря', str(tokenizer.tokenize('несмотря на это').words[0]))
+        with self.assertRaises(ValueError):
+            WordTokenizer(lexicon=self.path, case_sensitive=False)
+
+    def test_extend(self):
+        WordTokenizer(mwes=['в течение']).save_lexicon(self.path)
+        tokenizer = WordTokenizer(lexicon=self.path)
+        tokenizer.add_mwe('потому что')
+        self.assertIsInstance(tokenizer._mwe_trie, MWETrie)
+        words = [str(w) for w in tokenizer.tokenize('в течение дня, потому что').words]
+        self.assertEqual(['в течение', ' ', 'дня', ', ', 'потому что'], words)
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a lexicon file at all, just some bytes')
+        with self.assertRaises(ValueError):
+            CompiledMWETrie.open(self.path)
+
+        # Truncated anywhere, including inside the key blob, or with trailing bytes.
+        WordTokenizer(mwes=COMMON_MWES).save_lexicon(self.path)
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        maps = []
+
+        def mapped(*args, **kwargs):
+            maps.append(real_mmap(*args, **kwargs))
+            return maps[-1]
+
+        for size in list(range(0, len(data), 7)) + [len(data) - 1, len(data) + 1]:
+            with open(self.path, 'wb') as f:
+                f.write((data + b'\0')[:size])
+            with self.assertRaises(ValueError), mock.patch('mmap.mmap', side_effect=mapped):
+                CompiledMWETrie.open(self.path)
+        # Every rejected file is unmapped right away.
+        self.assertTrue(len(maps) > 0 and all(m.closed for m in maps))
+
+
+if __name__ == '__main__':
+    unittest.main()
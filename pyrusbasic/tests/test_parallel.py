@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import pickle
+import unittest
+from pyrusbasic import Word, WordList, WordTokenizer
+from pyrusbasic.const import COMMON_MWES
+
+TEXTS = [
+    'Все счастливые семьи похожи друг на друга, каждая несчастливая семья несчастлива по-своему.',
+    'Несмотря на то, что чья-то карета...',
+    'Он любил ее не потому, что она обладала неземной красотой.',
+    'НАСА, высота 82,7 км',
+] * 10
+
+class TestTokenizeMany(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = WordTokenizer(mwes=COMMON_MWES)
+        self.expected = [[str(w) for w in self.tokenizer.tokenize(t).words] for t in TEXTS]
+
+    def test_ordered(self):
+        for workers in (1, 2):
+            results = self.tokenizer.tokenize_many(TEXTS, workers=workers, chunksize=3)
+            self.assertEqual(self.expected, [[str(w) for w in wl.words] for wl in results])
+
+    def test_unordered(self):
+        results = dict(self.tokenizer.tokenize_many(iter(TEXTS), workers=2, chunksize=5, ordered=False))
+        self.assertEqual(list(range(len(TEXTS))), sorted(results))
+        self.assertEqual(self.expected, [[str(w) for w in results[i].words] for i in range(len(TEXTS))])
+
+    def test_errors(self):
+        texts = ['один', None, 'два']
+        results = list(self.tokenizer.tokenize_many(texts, workers=2, chunksize=1, return_exceptions=True))
+        self.assertEqual('один', str(results[0].words[0]))
+        self.assertIsInstance(results[1], Exception)
+        self.assertEqual('два', str(results[2].words[0]))
+        with self.assertRaises(Exception):
+            list(self.tokenizer.tokenize_many(texts, workers=1))
+
+    def test_pickle_wordlist(self):
+        def words(wordlist):
+            return [(w.tokens, w.word_type, w.start, w.end) for w in wordlist.words]
+
+        wordlist = self.tokenizer.tokenize('Мама мыла раму. Да!')
+        filtered = WordList([w for w in wordlist.words if w.is_russian()], text=wordlist.text)
+        spans = self.tokenizer.tokenize('Мама мыла раму. Да!', compact=True)
+        spans = WordList(spans.words, text=spans.text)
+        for original in (wordlist, filtered, spans, WordList([Word('да'), Word(['по', '-', 'русски'])])):
+            restored = pickle.loads(pickle.dumps(original))
+            self.assertEqual(original.text, restored.text)
+            self.assertEqual(words(original), words(restored))
+        self.assertEqual([(5, 9), (16, 18)], [(w.start, w.end) for w in pickle.loads(pickle.dumps(filtered)).words[1::2]])
+        self.assertEqual([None, None], [w.start for w in pickle.loads(pickle.dumps(WordList([Word('да'), Word('нет')]))).words])
+
+        # Pickling does not split span words into tokens.
+        spans = WordList(self.tokenizer.tokenize('Мама мыла раму.', compact=True).words)
+        pickle.dumps(spans)
+        self.assertTrue(all(w._tokens is None for w in spans.words))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import unittest
+from pyrusbasic import WordTokenizer, WordList, ColumnarWordList
+from pyrusbasic.const import COMMON_MWES
+
+TEXT = ('Мото́р заглох. Несмотря на то, что чья-то карета... «Куда?» — спросил он.\n\n'
+        'Все было и т.д. и т.п. Потом по-русски! Конец')
+
+def words(wordlist):
+    return [(str(w), w.word_type, w.start, w.end) for w in wordlist.words]
+
+class TestSplit(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = WordTokenizer(mwes=COMMON_MWES)
+
+    def test_split(self):
+        pieces = self.tokenizer.split(TEXT)
+        self.assertEqual(self.tokenizer.tokenize(TEXT).text, ''.join(pieces))
+        self.assertEqual('Мото́р заглох. ', pieces[0])
+        self.assertEqual('Несмотря на то, что чья-то карета... «', pieces[1])
+        self.assertEqual(['Куда?» — ', 'спросил он.\n\n'], pieces[2:4])
+        self.assertEqual(['Все было и т.д. ', 'и т.п. ', 'Потом по-русски! ', 'Конец'], pieces[4:])
+        self.assertEqual([], self.tokenizer.split(''))
+
+    def test_mwe_is_not_split(self):
+        # The expression continues after a '. ' token, so the text is never cut after one.
+        tokenizer = WordTokenizer(mwes=['и т.д. и т.п.'])
+        pieces = tokenizer.split(TEXT)
+        self.assertEqual('Мото́р заглох. Несмотря на то, что чья-то карета... «', pieces[0])
+        self.assertEqual('Все было и т.д. и т.п. Потом по-русски! ', pieces[3])
+        joined = WordList.concatenate([tokenizer.tokenize(p) for p in pieces])
+        self.assertEqual(words(tokenizer.tokenize(TEXT)), words(joined))
+
+        # The cuts follow expressions added after an earlier split.
+        tokenizer = WordTokenizer()
+        self.assertEqual('Все было и т.д. ', tokenizer.split(TEXT)[4])
+        tokenizer.add_mwe('и т.д. и т.п.')
+        pieces = tokenizer.split(TEXT)
+        self.assertEqual('Все было и т.д. и т.п. Потом по-русски! ', pieces[3])
+
+    def test_min_length(self):
+        pieces = self.tokenizer.split(TEXT, min_length=40)
+        self.assertEqual([53, 45, 22], [len(p) for p in pieces])
+        self.assertEqual(self.tokenizer.tokenize(TEXT).text, ''.join(pieces))
+
+    def test_concatenate(self):
+        pieces = self.tokenizer.split(TEXT)
+        joined = WordList.concatenate([self.tokenizer.tokenize(p) for p in pieces])
+        expected = self.tokenizer.tokenize(TEXT)
+        self.assertEqual(expected.text, joined.text)
+        self.assertEqual(words(expected), words(joined))
+
+        compact = WordList.concatenate([self.tokenizer.tokenize(p, compact=True) for p in pieces])
+        expected = self.tokenizer.tokenize(TEXT, compact=True)
+        self.assertIsInstance(compact, ColumnarWordList)
+        self.assertEqual(words(expected), words(compact))
+        self.assertEqual(list(expected.starts), list(compact.starts))
+        self.assertEqual(list(expected.ends), list(compact.ends))
+
+        # Span-based words are replaced, not shifted in place.
+        lists = [self.tokenizer.tokenize(p, compact=True) for p in pieces]
+        lists = [WordList(wordlist.words, text=wordlist.text) for wordlist in lists]
+        self.assertEqual(words(expected), words(WordList.concatenate(lists)))
+        self.assertEqual(0, lists[1].words[0].start)
+
+    def test_tokenize_parallel(self):
+        text = TEXT * 20
+        expected = words(self.tokenizer.tokenize(text))
+        for workers in (1, 2):
+            self.assertEqual(expected, words(self.tokenizer.tokenize_parallel(text, workers=workers, min_length=500)))
+
+if __name__ == '__main__':
+    unittest.main()
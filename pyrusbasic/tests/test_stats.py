@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import pickle
+import unittest
+from pyrusbasic import WordTokenizer
+from pyrusbasic.const import COMMON_MWES
+from pyrusbasic.stats import STAGES, TokenizerStats
+from pyrusbasic.vocab import Vocabulary
+
+TEXT = 'Несмотря на то, что мото́р новый, по-русски несмотря на дождь.'
+
+class TestProfiling(unittest.TestCase):
+    def test_disabled(self):
+        tokenizer = WordTokenizer()
+        self.assertIsNone(tokenizer.stats)
+        self.assertNotIn('_tokenize', vars(tokenizer))
+
+    def test_stats(self):
+        tokenizer = WordTokenizer(mwes=['несмотря на то, что'], profile=True)
+        wordlist = tokenizer.tokenize(TEXT)
+        stats = tokenizer.stats
+        self.assertEqual(len(wordlist.text), stats.characters)
+        self.assertEqual(len(WordTokenizer()._tokenize(wordlist.text)), stats.tokens)
+        self.assertEqual(len(wordlist), stats.words)
+        self.assertEqual(len(wordlist), stats.counts['build'])
+        self.assertEqual(1, stats.calls['preprocess'])
+        self.assertTrue(all(stats.seconds[stage] >= 0 for stage in STAGES))
+        # Seven russian words were looked up, one of them starts an expression.
+        self.assertEqual((7, 1), (stats.mwe_probes, stats.mwe_hits))
+        self.assertEqual(1 / 7, stats.mwe_hit_rate)
+
+        stats.reset()
+        tokenizer.tokenize(TEXT, compact=True)
+        tokenizer.encode(TEXT, Vocabulary())
+        self.assertEqual(2 * len(wordlist), stats.words)
+        self.assertEqual(2 * len(wordlist), stats.counts['build'])
+        self.assertEqual(2, stats.mwe_hits)
+
+    def test_unrecorded(self):
+        tokenizer = WordTokenizer(profile=True)
+        tokenizer.add_mwes(COMMON_MWES)
+        tokenizer.add_mwe('в течение')
+        self.assertEqual(0, sum(tokenizer.stats.calls.values()))
+        wordlist = tokenizer.tokenize(TEXT)
+        tokenizer.stats.reset()
+        tokenizer.split(TEXT)
+        tokenizer.retokenize(wordlist, 3, 1, 'а')
+        self.assertEqual(0, sum(tokenizer.stats.calls.values()))
+
+    def test_cache_and_hooks(self):
+        events = []
+        tokenizer = WordTokenizer(cache_size=10, hooks=[lambda *event: events.append(event)])
+        for text in ('да', 'нет', 'да'):
+            tokenizer.tokenize(text)
+        self.assertEqual((1, 2), (tokenizer.stats.cache_hits, tokenizer.stats.cache_misses))
+        self.assertEqual(['cache', 'preprocess', 'tokenize', 'assemble', 'build'], [e[0] for e in events[:5]])
+        self.assertEqual(('cache', 0.0, 1), events[-2])
+        self.assertEqual(tokenizer.stats.calls['build'], sum(1 for e in events if e[0] == 'build'))
+        metrics = tokenizer.stats.as_dict()
+        self.assertEqual(2, metrics['cache_misses'])
+        self.assertEqual(3, metrics['build.calls'])
+
+    def test_pickle_and_merge(self):
+        tokenizer = WordTokenizer(profile=True)
+        tokenizer.tokenize(TEXT)
+        copy = pickle.loads(pickle.dumps(tokenizer))
+        self.assertIsNone(copy.stats)
+        self.assertEqual([str(w) for w in tokenizer.tokenize(TEXT).words], [str(w) for w in copy.tokenize(TEXT).words])
+        total = TokenizerStats().merge(tokenizer.stats).merge(tokenizer.stats)
+        self.assertEqual(2 * tokenizer.stats.words, total.words)
+        tokenizer.disable_profiling()
+        self.assertIsNone(tokenizer.stats)
+        self.assertNotIn('_tokenize', vars(tokenizer))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import io
+import random
+import unittest
+from pyrusbasic import WordTokenizer
+from pyrusbasic.const import COMMON_MWES
+
+TEXT = (
+    'Несмотря на то, что еще не много времени прошло с тех пор, как князь Андре́й оставил Россию, '
+    'он много изменился за это время. Жила́-была́ на све́те лягу́шка-кваку́шка. НАСА, высота 82,7 км. '
+    'Он любил её не потому, что она обладала неземной красотой.\n\n'
+)
+
+def chunked(text, sizes):
+    start = 0
+    for size in sizes:
+        yield text[start:start + size]
+        start += size
+    yield text[start:]
+
+class TestTokenizeIter(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = WordTokenizer(mwes=COMMON_MWES)
+        self.tokenizer.add_mwe('еще не много')
+
+    def assertSameWords(self, expected, actual):
+        self.assertEqual([(w.tokens, w.word_type) for w in expected], [(w.tokens, w.word_type) for w in actual])
+
+    def test_file_object(self):
+        text = TEXT * 20
+        expected = self.tokenizer.tokenize(text).words
+        self.assertSameWords(expected, self.tokenizer.tokenize_iter(io.StringIO(text), chunk_size=7))
+        self.assertSameWords(expected, self.tokenizer.tokenize_iter(text))
+
+    def test_random_chunk_boundaries(self):
+        rng = random.Random(42)
+        text = TEXT * 5
+        expected = self.tokenizer.tokenize(text).words
+        for _ in range(20):
+            sizes = [rng.randint(1, 12) for _ in range(len(text) // 6)]
+            self.assertSameWords(expected, self.tokenizer.tokenize_iter(chunked(text, sizes)))
+
+    def test_combining_accent_at_chunk_start(self):
+        chunks = ['лягу', '́', 'шка-', 'кваку́шка']
+        words = list(self.tokenizer.tokenize_iter(chunks))
+        self.assertEqual(['лягу́шка-кваку́шка'], [str(w) for w in words])
+
+
+if __name__ == '__main__':
+    unittest.main()
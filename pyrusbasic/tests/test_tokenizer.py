@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 import unittest
-from pyrusbasic import Word, WordTokenizer
+import pickle
+import unicodedata
+from unittest import mock
+from pyrusbasic import Word, WordTokenizer, ColumnarWordList
+from pyrusbasic import tokenizer as tokenizer_module
 
 class TestWord(unittest.TestCase):
     def test_accents(self):
@@ -18,7 +22,48 @@ class TestWord(unittest.TestCase):
             self.assertEqual(unaccented, word.gettext(remove_accents=True))
             self.assertEqual(1, word.count())
 
+    def test_cached_text(self):
+        word = Word(['По', '-', 'ру́сски'])
+        self.assertEqual('По-ру́сски', word.gettext())
+        self.assertEqual('по-ру́сски', word.lower())
+        self.assertEqual('По-русски', word.gettext(remove_accents=True))
+        self.assertEqual('Порусски', word.gettext(remove_accents=True, remove_punct=True))
+        word.tokens.append('!')
+        self.assertEqual('По-ру́сски!', word.gettext())
+        self.assertEqual('по-ру́сски!', word.lower())
+        word.tokens = ['да']
+        self.assertEqual('да', word.gettext())
+
+        # Changes through a kept reference to the list are detected too.
+        tokens = word.tokens
+        self.assertEqual('да', str(word))
+        tokens.append('!')
+        self.assertEqual('да!', str(word))
+        tokens[0] = 'нет'
+        self.assertEqual('нет!', str(word))
+        self.assertIn(word, {Word(['нет', '!'])})
+
+    def test_hash(self):
+        words = [Word('да'), Word('нет'), Word(['да']), Word('Да')]
+        self.assertEqual(3, len(set(words)))
+        self.assertEqual({'да': 2, 'нет': 1, 'Да': 1}, {str(w): n for w, n in {w: words.count(w) for w in words}.items()})
+        self.assertEqual(['Да', 'да', 'да', 'нет'], [str(w) for w in sorted(words)])
+        self.assertNotEqual(Word('да'), 'да')
+
 class TestTokenizer(unittest.TestCase):
+    def test_preprocess(self):
+        tokenizer = WordTokenizer()
+        decomposed = 'све\u0301те и\u0306 е\u0308'
+        self.assertEqual(decomposed, tokenizer._preprocess(decomposed))
+        self.assertEqual(decomposed, tokenizer._preprocess('све́те й ё'))
+        self.assertEqual('из-за', tokenizer._preprocess('из\u2013за'))
+
+    @unittest.skipUnless(hasattr(unicodedata, 'is_normalized'), 'requires unicodedata.is_normalized')
+    def test_preprocess_normalized_input_is_not_copied(self):
+        tokenizer = WordTokenizer()
+        for text in ('plain ascii text, 42', 'све\u0301те и\u0306 е\u0308'):
+            self.assertIs(text, tokenizer._preprocess(text))
+
     def test_unaccented(self):
         tokenizer = WordTokenizer()
         text = 'Все счастливые семьи похожи друг на друга, каждая несчастливая семья несчастлива по-своему.\n\n'
@@ -153,6 +198,103 @@ class TestTokenizer(unittest.TestCase):
         reconstructed_text = ''.join(map(str, wordlist.words))
         self.assertEqual(text, reconstructed_text)
 
+    def test_word_types(self):
+        tokenizer = WordTokenizer()
+        tokenizer.add_mwe('несмотря на')
+        text = 'Несмотря на дождь, по-своему 82 «abc»'
+        expected = [
+            ('Несмотря на', Word.TYPE_MWE),
+            (' ', Word.TYPE_WHITESPACE),
+            ('дождь', Word.TYPE_WORD),
+            (', ', Word.TYPE_PUNCT),
+            ('по-своему', Word.TYPE_HYPHENATED_WORD),
+            (' ', Word.TYPE_WHITESPACE),
+            ('82', Word.TYPE_NUMERIC),
+            (' «abc»', Word.TYPE_UNDEFINED),
+        ]
+        wordlist = tokenizer.tokenize(text)
+        self.assertEqual(expected, [(str(w), w.word_type) for w in wordlist.words])
+
+    def test_compact(self):
+        tokenizer = WordTokenizer()
+        tokenizer.add_mwe('несмотря на то, что')
+        text = 'Несмотря на то, что чья-то карета... све́те 82,7'
+        expected = tokenizer.tokenize(text)
+        compact = tokenizer.tokenize(text, compact=True)
+        self.assertEqual(expected.text, compact.text)
+        self.assertEqual(len(expected.words), len(compact.words))
+        for word, span in zip(expected.words, compact.words):
+            self.assertFalse(hasattr(span, '__dict__'))
+            self.assertIs(compact.text, span.source)
+            self.assertEqual((word.start, word.end, word.word_type), (span.start, span.end, span.word_type))
+            self.assertEqual(word.gettext(remove_accents=True), span.gettext(remove_accents=True))
+            self.assertEqual(compact.text[span.start:span.end], ''.join(span.tokens))
+            self.assertEqual(word.tokens, span.tokens)
+
+    def test_columnar(self):
+        tokenizer = WordTokenizer()
+        tokenizer.add_mwe('несмотря на')
+        text = 'Несмотря на дождь, по-своему 82 дождь Дождь дождь!'
+        wordlist = tokenizer.tokenize(text)
+        columnar = tokenizer.tokenize(text, compact=True)
+        self.assertIsInstance(columnar, ColumnarWordList)
+        self.assertEqual(len(wordlist), len(columnar))
+        self.assertEqual(wordlist.unique(), columnar.unique())
+        self.assertEqual(wordlist.unique(case_sensitive=True), columnar.unique(case_sensitive=True))
+        self.assertEqual({Word.TYPE_MWE: 1, Word.TYPE_WORD: 4, Word.TYPE_HYPHENATED_WORD: 1, Word.TYPE_NUMERIC: 1,
+                          Word.TYPE_WHITESPACE: 5, Word.TYPE_PUNCT: 2}, columnar.counts())
+        russian = columnar.filter(Word.TYPE_WORD, Word.TYPE_HYPHENATED_WORD)
+        self.assertEqual(['дождь', 'по-своему', 'дождь', 'Дождь', 'дождь'], [str(w) for w in russian.words])
+        self.assertEqual('по-своему', str(russian[1]))
+        restored = pickle.loads(pickle.dumps(columnar))
+        self.assertEqual([str(w) for w in columnar.words], [str(w) for w in restored.words])
+
+    def test_strings(self):
+        tokenizer = WordTokenizer()
+        text = 'Мото́р, «по-ру́сски» ΟΔΟΣ ﬁ\x00x Ёлка!'
+        for wordlist in (tokenizer.tokenize(text), tokenizer.tokenize(text, compact=True),
+                         tokenizer.tokenize(text.replace('\x00', ''))):
+            words = wordlist.words
+            self.assertEqual([str(w) for w in words], wordlist.strings())
+            self.assertEqual([w.gettext(remove_accents=True, remove_punct=True) for w in words],
+                             wordlist.strings(remove_accents=True, remove_punct=True))
+            self.assertEqual([w.lower() for w in words], wordlist.strings(lower=True))
+            strings = wordlist.strings(remove_accents=True, lower=True)
+            joined, starts, ends = wordlist.joined(remove_accents=True, lower=True)
+            self.assertEqual(''.join(strings), joined)
+            self.assertEqual(strings, [joined[start:end] for start, end in zip(starts, ends)])
+        joined, starts, ends = tokenizer.tokenize('').joined()
+        self.assertEqual(('', 0, 0), (joined, len(starts), len(ends)))
+
+
+class TestEngine(unittest.TestCase):
+    TEXT = ('Несмотря на то, что мото́р по-ру́сски «ёлка»-палка 2024 г. x́ \t\n-- ٣١ a-б, и т.д.! '
+            'Из-за того, что по- и наоборот ')
+
+    def test_invalid_engine(self):
+        self.assertRaises(ValueError, WordTokenizer, engine='fortran')
+
+    @unittest.skipIf(tokenizer_module.numpy is not None, 'requires NumPy to be missing')
+    def test_numpy_missing(self):
+        self.assertRaises(ImportError, WordTokenizer, engine='numpy')
+        tokenizer = WordTokenizer(engine='auto')
+        text = self.TEXT * 2000
+        self.assertEqual(len(tokenizer.tokenize(text).words), len(tokenizer.tokenize(text, compact=True)))
+
+    @unittest.skipUnless(tokenizer_module.numpy is not None, 'requires NumPy')
+    def test_numpy_matches_python(self):
+        text = self.TEXT * 50
+        for mwes in (None, ['несмотря на то, что', 'из-за того, что', 'по-русски', 'и т.д.']):
+            expected = WordTokenizer(engine='python', mwes=mwes).tokenize(text, compact=True)
+            tokenizer = WordTokenizer(engine='numpy', mwes=mwes)
+            # Small blocks, so that words are grouped across block boundaries.
+            for block_size in (tokenizer_module.NUMPY_BLOCK_SIZE, 7):
+                with mock.patch.object(tokenizer_module, 'NUMPY_BLOCK_SIZE', block_size):
+                    result = tokenizer.tokenize(text, compact=True)
+                self.assertEqual(list(expected.types), list(result.types))
+                self.assertEqual(list(expected.starts), list(result.starts))
+                self.assertEqual(list(expected.ends), list(result.ends))
+
 
 if __name__ == '__main__':
     unittest.main()
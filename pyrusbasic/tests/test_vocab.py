@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import os
+import pickle
+import tempfile
+import unittest
+from pyrusbasic import Word, WordTokenizer
+from pyrusbasic.vocab import Vocabulary
+
+TEXT = 'Несмотря на то, что мото́р новый, мото́р заглох. 12 по-русски, 12 раз.'
+
+class TestVocabulary(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = WordTokenizer(mwes=['несмотря на то, что'])
+
+    def test_encode(self):
+        vocab = Vocabulary()
+        ids, types = self.tokenizer.encode(TEXT, vocab)
+        words = self.tokenizer.tokenize(TEXT).words
+        self.assertEqual([str(w) for w in words], [vocab[i] for i in ids])
+        self.assertEqual([w.word_type for w in words], list(types))
+        self.assertEqual(''.join(str(w) for w in words), vocab.decode(ids))
+        self.assertEqual(Word.TYPE_MWE, types[0])
+        self.assertEqual(2, list(ids).count(vocab.get('мото́р')))
+        self.assertEqual(len(vocab), len(set(ids)))
+
+        # Encoding more text reuses the ids of known words.
+        more_ids, _ = self.tokenizer.encode('мото́р', vocab)
+        self.assertEqual([vocab.get('мото́р')], list(more_ids))
+
+    def test_long_text(self):
+        vocab = Vocabulary()
+        ids, types = self.tokenizer.encode(TEXT * 5000, vocab)
+        self.assertEqual(len(self.tokenizer.tokenize(TEXT * 5000, compact=True)), len(ids))
+        self.assertEqual(len(ids), len(types))
+
+    def test_frozen(self):
+        vocab = Vocabulary(unknown='<unk>')
+        self.tokenizer.encode('мото́р новый', vocab)
+        vocab.freeze()
+        ids, _ = self.tokenizer.encode('мото́р старый', vocab)
+        self.assertEqual(['мото́р', ' ', '<unk>'], [vocab[i] for i in ids])
+        strict = Vocabulary(['новый'])
+        strict.freeze()
+        self.assertRaises(KeyError, self.tokenizer.encode, 'старый', strict)
+
+    def test_save_and_load(self):
+        vocab = Vocabulary()
+        ids, _ = self.tokenizer.encode(TEXT, vocab)
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            vocab.save(path)
+            loaded = Vocabulary.load(path)
+        finally:
+            os.remove(path)
+        self.assertEqual(list(ids), list(self.tokenizer.encode(TEXT, loaded)[0]))
+        self.assertEqual(len(vocab), len(loaded))
+        copy = pickle.loads(pickle.dumps(vocab))
+        self.assertEqual(list(ids), list(self.tokenizer.encode(TEXT, copy)[0]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,20 @@
 import string
 import re
 import unicodedata
-import collections
+import array
 import bisect
+import collections
+import itertools
+import sys
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 from .const import (
+    RUS_ALPHABET_LIST,
     RUS_ALPHABET_STR,
     RUS_ALPHABET_SET,
     COMBINING_ACCENT_CHAR,
@@ -13,14 +23,59 @@ from .const import (
     COMBINING_DIURESIS_CHAR,
     EN_DASH_CHAR,
     HYPHEN_CHAR,
-    RUS_PUNCT
+    RUS_PUNCT,
+    SENTENCE_END_PUNCT
 )
+from .mwe import MWETrie, CompiledMWETrie, MWELoadResult
+from .cache import LRUCache
+from .stats import TokenizerStats
+from . import parallel
 
-RE_DIGITS_ONLY = re.compile(r'^\d+$')
-RE_WHITESPACE_ONLY = re.compile(r'^\s+$')
 TRANSLATOR_PUNCT_REMOVE = str.maketrans('', '', string.punctuation)
+TRANSLATOR_PUNCT_WHITESPACE_REMOVE = str.maketrans('', '', RUS_PUNCT + string.whitespace)
+COMBINING_CHARS = COMBINING_ACCENT_CHAR + COMBINING_BREVE_CHAR + COMBINING_DIURESIS_CHAR
+RE_TOKEN_SPLIT = re.compile("([0-9]+|[^0-9" + RUS_ALPHABET_STR + COMBINING_CHARS + "]+)")
+# A whole token of punctuation and whitespace that contains a sentence end followed by whitespace, or a line
+# break.
+RE_SENTENCE_END = re.compile("(?<![^0-9" + RUS_ALPHABET_STR + COMBINING_CHARS + "])" +
+                             "[" + re.escape(RUS_PUNCT + string.whitespace) + "]*" +
+                             "(?:[" + re.escape(SENTENCE_END_PUNCT) + "][" + re.escape(RUS_PUNCT) + "]*" +
+                             "[" + re.escape(string.whitespace) + "]|\n)" +
+                             "[" + re.escape(RUS_PUNCT + string.whitespace) + "]*" +
+                             "(?![^0-9" + RUS_ALPHABET_STR + COMBINING_CHARS + "])")
+SCAN_BLOCK_SIZE = 65536
+# Minimum length of the pieces a text is split into by tokenize_parallel().
+SPLIT_LENGTH = 1 << 20
+# Texts are scanned by the NumPy engine in blocks of this many characters, and with engine='auto' only texts
+# of at least NUMPY_MIN_LENGTH characters use it.
+NUMPY_BLOCK_SIZE = 1 << 20
+NUMPY_MIN_LENGTH = 1 << 16
+ENGINES = ('auto', 'python', 'numpy')
+# Pipeline methods replaced by timed versions on a profiled tokenizer, see WordTokenizer.enable_profiling().
+PROFILED_METHODS = ('_preprocess', '_tokenize', '_assemble', '_assemble_numpy', '_words', '_spans', '_ids')
+# Separates the words in the buffer that WordList.strings() transforms. A control character that is left
+# unchanged by every transformation and never composes with its neighbours under NFKC.
+EXPORT_SEPARATOR = '\x00'
+
+# Words [start:old_stop] of a previous result that were replaced by words [start:new_stop] of the new one.
+ChangedRange = collections.namedtuple('ChangedRange', ['start', 'old_stop', 'new_stop'])
+
+if hasattr(str, 'isascii'):
+    _isascii = str.isascii
+else:
+    def _isascii(text):
+        return False
+
+if hasattr(unicodedata, 'is_normalized'):
+    def _is_normalized(form, text):
+        return unicodedata.is_normalized(form, text)
+else:
+    def _is_normalized(form, text):
+        return False
 
 class Word(object):
+    __slots__ = ('_tokens', 'word_type', 'source', 'start', 'end', '_text', '_raw')
+
     TYPE_UNDEFINED = 0
     TYPE_WORD = 1
     TYPE_HYPHENATED_WORD = 2
@@ -29,35 +84,94 @@ class Word(object):
     TYPE_WHITESPACE = 5
     TYPE_PUNCT = 6
 
-    def __init__(self, tokens=None, word_type:int = TYPE_UNDEFINED):
+    def __init__(self, tokens=None, word_type:int = TYPE_UNDEFINED, start:int = None, end:int = None):
         '''
         :param list tokens: list of strings
         :param int word_type: word type indicator
+        :param int start: offset of the word in the normalized text it was parsed from, if known
+        :param int end: offset of the end of the word in the normalized text, if known
         '''
         if tokens is None:
-            self.tokens = []
+            self._tokens = []
         elif isinstance(tokens, str):
-            self.tokens = [tokens]
+            self._tokens = [tokens]
         else:
-            self.tokens = tokens
+            self._tokens = tokens
         self.word_type = word_type
+        self.source = None
+        self.start = start
+        self.end = end
+        self._text = None
+        self._raw = None
+
+    @classmethod
+    def from_span(cls, source, start, end, word_type=TYPE_UNDEFINED):
+        '''
+        Returns a word that refers to a span of a source string rather than holding its own tokens. The text
+        and tokens are only materialized when they are asked for.
+
+        :param str source: normalized text the word was parsed from
+        :param int start: offset of the word in the source
+        :param int end: offset of the end of the word in the source
+        :param int word_type: word type indicator
+        :return: a new Word instance
+        '''
+        word = cls.__new__(cls)
+        word._tokens = None
+        word.word_type = word_type
+        word.source = source
+        word.start = start
+        word.end = end
+        word._text = None
+        word._raw = None
+        return word
+
+    @property
+    def tokens(self):
+        '''
+        List of token strings in the word.
+        '''
+        return self._token_list()
+
+    @tokens.setter
+    def tokens(self, tokens):
+        self._tokens = tokens
+        self._text = None
+
+    def _token_list(self):
+        if self._tokens is None:
+            self._tokens = [t for t in RE_TOKEN_SPLIT.split(self.source[self.start:self.end]) if t != '']
+        return self._tokens
 
     def gettext(self, remove_accents=False, remove_punct=False):
         '''
-        Returns the word as a string.
+        Returns the word as a string. The plain text, which is also the sort and hash key of the word, is
+        memoized together with the joined tokens it was made from. Joining the tokens again is enough to
+        detect that they were changed in place, and needs no copy for a word of one token.
 
         :param bool remove_accents: Remove acute accent marks
         :param bool remove_punct: Remove punctuation
-        :param bool lowercase: Lowercase the string
-        :param bool stripspace: Strip leading or trailing whitespace
         :return: the word string
         '''
-        text = ''.join(self.tokens)
+        if not (remove_accents or remove_punct):
+            text = self._text
+            if text is not None and (self._tokens is None or ''.join(self._tokens) == self._raw):
+                return text
+            return self._plain_text()
+        text = self.source[self.start:self.end] if self._tokens is None else ''.join(self._tokens)
         if remove_accents:
             text = text.replace(COMBINING_ACCENT_CHAR, '')
         if remove_punct:
             text = text.translate(TRANSLATOR_PUNCT_REMOVE)
-        return unicodedata.normalize('NFKC', text)
+        if not _isascii(text):
+            text = unicodedata.normalize('NFKC', text)
+        return text
+
+    def _plain_text(self):
+        raw = self.source[self.start:self.end] if self._tokens is None else ''.join(self._tokens)
+        self._raw = raw
+        self._text = raw if _isascii(raw) else unicodedata.normalize('NFKC', raw)
+        return self._text
 
     def lower(self):
         return self.gettext().lower()
@@ -70,38 +184,95 @@ class Word(object):
         Number of tokens in the word.
         :return: number of tokens
         '''
-        return len(self.tokens)
+        return len(self._token_list())
 
     def copy(self):
         '''
         Returns a copy of the word.
         :return: a new Word instance
         '''
-        return Word(tokens=self.tokens.copy(), word_type=self.word_type)
+        return Word(tokens=self._token_list().copy(), word_type=self.word_type)
 
     def is_russian(self):
         return self.word_type in (self.TYPE_WORD, self.TYPE_HYPHENATED_WORD, self.TYPE_MWE)
 
     def __eq__(self, other):
+        if not isinstance(other, Word):
+            return NotImplemented
         return self.gettext() == other.gettext()
 
+    def __hash__(self):
+        return hash(self.gettext())
+
     def __lt__(self, other):
-        return self.gettext() < other.gettext()
+        # gettext() inlined, since sorting compares each word many times.
+        a = self._text
+        if a is None or (self._tokens is not None and ''.join(self._tokens) != self._raw):
+            a = self._plain_text()
+        b = other._text
+        if b is None or (other._tokens is not None and ''.join(other._tokens) != other._raw):
+            b = other._plain_text()
+        return a < b
 
     def __le__(self, other):
-        a, b = self.gettext(), other.gettext()
-        return a == b or a < b
+        return self.gettext() <= other.gettext()
+
+    def __reduce__(self):
+        return (Word, (self._token_list(), self.word_type, self.start, self.end))
 
     def __repr__(self):
-        return "Word(%s,%s)" % (self.tokens, self.word_type)
+        return "Word(%s,%s)" % (self._token_list(), self.word_type)
 
     def __str__(self):
         return self.gettext()
 
 
+# Lookup table from the first character of a token to the type of word it starts. Tokens starting with any
+# other character are classified as whitespace, numeric, punctuation or undefined.
+TOKEN_CLASSES = dict.fromkeys(RUS_ALPHABET_LIST, Word.TYPE_WORD)
+TOKEN_CLASSES.update(dict.fromkeys(string.digits, Word.TYPE_NUMERIC))
+
+
+def _export_text(text, remove_accents, remove_punct, lower):
+    '''
+    Applies the transformations of `WordList.strings()` to a string.
+    '''
+    if remove_accents:
+        text = text.replace(COMBINING_ACCENT_CHAR, '')
+    if remove_punct:
+        text = text.translate(TRANSLATOR_PUNCT_REMOVE)
+    if not _isascii(text):
+        text = unicodedata.normalize('NFKC', text)
+    if lower:
+        text = text.lower()
+    return text
+
+
 class WordList(object):
-    def __init__(self, words):
+    def __init__(self, words, text=None):
+        '''
+        :param list words: list of Word objects
+        :param str text: normalized text the words were parsed from, if known
+        '''
         self.words = words
+        self.text = text
+
+    @property
+    def words(self):
+        '''
+        List of Word objects. Offsets left to shift by `WordTokenizer.retokenize()` are applied first.
+        '''
+        if self._shift:
+            _shift_words(self._words, self._shift_index, len(self._words), self._shift)
+            self._shift = 0
+        return self._words
+
+    @words.setter
+    def words(self, words):
+        self._words = words
+        # Words from this index on are still to be shifted by this many characters, see `retokenize()`.
+        self._shift_index = 0
+        self._shift = 0
 
     def unique(self, case_sensitive=False):
         wordset = set()
@@ -113,12 +284,401 @@ class WordList(object):
                 wordset.add(wordstr)
         return list(sorted(wordset))
 
+    def _raw_texts(self):
+        return [w.source[w.start:w.end] if w._tokens is None else ''.join(w._tokens) for w in self.words]
+
+    def strings(self, remove_accents=False, remove_punct=False, lower=False):
+        '''
+        Returns the text of every word, as `Word.gettext()` (or `Word.lower()`) would for each word.
+
+        The words are joined into one buffer separated by a control character, so that removing accents
+        and punctuation, normalizing and lowercasing are each done once for the whole list, and the buffer
+        is then split back into words.
+
+        :param bool remove_accents: Remove acute accent marks
+        :param bool remove_punct: Remove punctuation
+        :param bool lower: Lowercase the words
+        :return: list of strings
+        '''
+        texts = self._raw_texts()
+        if len(texts) == 0:
+            return []
+        buffer = EXPORT_SEPARATOR.join(texts)
+        if buffer.count(EXPORT_SEPARATOR) != len(texts) - 1:
+            # A word contains the separator itself, so the buffer cannot be split back: one word at a time.
+            return [_export_text(text, remove_accents, remove_punct, lower) for text in texts]
+        return _export_text(buffer, remove_accents, remove_punct, lower).split(EXPORT_SEPARATOR)
+
+    def joined(self, remove_accents=False, remove_punct=False, lower=False):
+        '''
+        Returns the text of all words as one string, with the offsets of each word in it (see `strings()`).
+
+        :param bool remove_accents: Remove acute accent marks
+        :param bool remove_punct: Remove punctuation
+        :param bool lower: Lowercase the words
+        :return: tuple of (string, array of start offsets, array of end offsets)
+        '''
+        strings = self.strings(remove_accents, remove_punct, lower)
+        ends = array.array('q', itertools.accumulate(map(len, strings)))
+        starts = ends[:-1]
+        if len(strings) > 0:
+            starts.insert(0, 0)
+        return ''.join(strings), starts, ends
+
+    @staticmethod
+    def concatenate(wordlists):
+        '''
+        Joins the results of tokenizing consecutive pieces of a text, e.g. the pieces returned by
+        `WordTokenizer.split()`, into the result for the whole text.
+
+        ColumnarWordLists are joined into a new ColumnarWordList over the joined text. Otherwise the offsets
+        of words that hold their own tokens are shifted in place, and span-based words are replaced by new
+        ones that refer to the joined text.
+
+        :param wordlists: iterable of WordList objects, in text order
+        :return: WordList instance
+        '''
+        wordlists = list(wordlists)
+        text = ''.join(wordlist.text for wordlist in wordlists)
+        if len(wordlists) > 0 and all(isinstance(wordlist, ColumnarWordList) for wordlist in wordlists):
+            result = ColumnarWordList(text)
+            offset = 0
+            for wordlist in wordlists:
+                result.types.extend(wordlist.types)
+                if offset:
+                    result.starts.extend(map(offset.__add__, wordlist.starts))
+                    result.ends.extend(map(offset.__add__, wordlist.ends))
+                else:
+                    result.starts.extend(wordlist.starts)
+                    result.ends.extend(wordlist.ends)
+                offset += len(wordlist.text)
+            return result
+        words = []
+        offset = 0
+        for wordlist in wordlists:
+            for word in wordlist.words:
+                if word._tokens is None:
+                    word = Word.from_span(text, word.start + offset, word.end + offset, word.word_type)
+                elif offset and word.start is not None:
+                    word.start += offset
+                    word.end += offset
+                words.append(word)
+            offset += len(wordlist.text)
+        return WordList(words, text=text)
+
+    def __len__(self):
+        return len(self._words)
+
+    def __reduce__(self):
+        # Pickle the words as one string plus arrays of token lengths, token counts, types and offsets (-1 for
+        # None), which is much smaller and faster than pickling each Word, e.g. when results are returned from
+        # worker processes. The string is left out when it is the text itself, as it is for a whole result.
+        token_lengths = array.array('I')
+        token_counts = array.array('I')
+        word_types = array.array('B')
+        starts = array.array('q')
+        ends = array.array('q')
+        tokens = []
+        for w in self.words:
+            # Split span words without caching their tokens on them.
+            word_tokens = w._tokens
+            if word_tokens is None:
+                word_tokens = [t for t in RE_TOKEN_SPLIT.split(w.source[w.start:w.end]) if t != '']
+            tokens.extend(word_tokens)
+            token_lengths.extend(map(len, word_tokens))
+            token_counts.append(len(word_tokens))
+            word_types.append(w.word_type)
+            starts.append(-1 if w.start is None else w.start)
+            ends.append(-1 if w.end is None else w.end)
+        tokens = ''.join(tokens)
+        if tokens == self.text:
+            tokens = None
+        return (_unpickle_wordlist, (self.text, tokens, token_lengths, token_counts, word_types, starts, ends))
+
     def __repr__(self):
         return "WordList(%s)" % (self.words)
 
     def __str__(self):
         return str(self.words)
 
+def _unpickle_wordlist(text, tokens_text, token_lengths, token_counts, word_types, starts, ends):
+    if tokens_text is None:
+        tokens_text = text
+    tokens = []
+    pos = 0
+    for length in token_lengths:
+        tokens.append(tokens_text[pos:pos + length])
+        pos += length
+    words = []
+    index = 0
+    for count, word_type, start, end in zip(token_counts, word_types, starts, ends):
+        words.append(Word(tokens[index:index + count], word_type, None if start < 0 else start,
+                          None if end < 0 else end))
+        index += count
+    return WordList(words, text=text)
+
+class ColumnarWordList(WordList):
+    '''
+    List of words stored as columns: an array of word types and arrays of start and end offsets into the
+    normalized text. Word objects are only created when `words` is accessed, and filtering, counting and
+    unique extraction work on the arrays directly instead of on one Python object per word.
+    '''
+
+    def __init__(self, text, types=None, starts=None, ends=None):
+        '''
+        :param str text: normalized text the words were parsed from
+        :param array types: word types (typecode 'B')
+        :param array starts: start offsets (typecode 'q')
+        :param array ends: end offsets (typecode 'q')
+        '''
+        self.text = text
+        self.types = array.array('B') if types is None else types
+        self._starts = array.array('q') if starts is None else starts
+        self._ends = array.array('q') if ends is None else ends
+        self._shift_index = 0
+        self._shift = 0
+        self._words = None
+
+    def _apply_shift(self):
+        if self._shift:
+            for offsets in (self._starts, self._ends):
+                _shift_offsets(offsets, self._shift_index, len(offsets), self._shift)
+            self._shift = 0
+
+    @property
+    def starts(self):
+        '''
+        Array of word start offsets (typecode 'q').
+        '''
+        self._apply_shift()
+        return self._starts
+
+    @property
+    def ends(self):
+        '''
+        Array of word end offsets (typecode 'q').
+        '''
+        self._apply_shift()
+        return self._ends
+
+    @property
+    def words(self):
+        '''
+        List of span-based Word objects, created on first access.
+        '''
+        if self._words is None:
+            text = self.text
+            self._words = [Word.from_span(text, start, end, word_type)
+                           for word_type, start, end in zip(self.types, self.starts, self.ends)]
+        return self._words
+
+    def _mask(self, word_types):
+        # One byte per word that is non-zero when its type is selected, computed with a single translate.
+        table = bytearray(256)
+        for word_type in word_types:
+            table[word_type] = 1
+        return self.types.tobytes().translate(table)
+
+    def filter(self, *word_types):
+        '''
+        Returns the words of the given types.
+
+        :param int word_types: one or more word types, e.g. Word.TYPE_WORD, Word.TYPE_MWE
+        :return: ColumnarWordList instance
+        '''
+        mask = self._mask(word_types)
+        return ColumnarWordList(
+            self.text,
+            array.array('B', itertools.compress(self.types, mask)),
+            array.array('q', itertools.compress(self.starts, mask)),
+            array.array('q', itertools.compress(self.ends, mask)),
+        )
+
+    def counts(self):
+        '''
+        Returns the number of words of each type.
+
+        :return: dict mapping word type to number of words
+        '''
+        data = self.types.tobytes()
+        return {word_type: data.count(word_type) for word_type in set(data)}
+
+    def _raw_texts(self):
+        text = self.text
+        return [text[start:end] for start, end in zip(self.starts, self.ends)]
+
+    def unique(self, case_sensitive=False):
+        '''
+        Returns the sorted unique russian words (see `WordList.unique()`). Each distinct span of text is
+        normalized once, rather than once per occurrence.
+
+        :param bool case_sensitive: preserve case
+        :return: sorted list of strings
+        '''
+        text = self.text
+        mask = self._mask((Word.TYPE_WORD, Word.TYPE_HYPHENATED_WORD, Word.TYPE_MWE))
+        spans = set(text[start:end] for start, end in zip(itertools.compress(self.starts, mask),
+                                                           itertools.compress(self.ends, mask)))
+        wordset = set(unicodedata.normalize('NFKC', span) for span in spans)
+        if not case_sensitive:
+            wordset = set(w.lower() for w in wordset)
+        return list(sorted(wordset))
+
+    def numpy(self):
+        '''
+        Returns zero-copy NumPy views of the columns. Requires NumPy.
+
+        :return: tuple of (types, starts, ends) numpy arrays
+        '''
+        if numpy is None:
+            raise ImportError("NumPy is required for ColumnarWordList.numpy()")
+        return (numpy.frombuffer(self.types, dtype=numpy.uint8),
+                numpy.frombuffer(self.starts, dtype=numpy.int64),
+                numpy.frombuffer(self.ends, dtype=numpy.int64))
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        return Word.from_span(self.text, self.starts[index], self.ends[index], self.types[index])
+
+    def __reduce__(self):
+        return (ColumnarWordList, (self.text, self.types, self.starts, self.ends))
+
+    def __repr__(self):
+        return "ColumnarWordList(%s)" % (self.words)
+
+
+def _shift_words(words, start, stop, shift):
+    for word in words[start:stop]:
+        if word.start is not None:
+            word.start += shift
+            word.end += shift
+
+
+def _shift_offsets(offsets, start, stop, shift):
+    offsets[start:stop] = array.array('q', map(shift.__add__, offsets[start:stop]))
+
+
+class _ShiftedOffsets(object):
+    '''
+    Read-only sequence of offsets of which those from an index on are still to be shifted, so that it can be
+    binary searched.
+    '''
+
+    def __init__(self, offsets, index, shift):
+        self._offsets = offsets
+        self._index = index
+        self._shift = shift
+
+    def __getitem__(self, index):
+        return self._offsets[index] + (self._shift if index >= self._index else 0)
+
+    def __len__(self):
+        return len(self._offsets)
+
+
+class _WordOffsets(object):
+    '''
+    Read-only sequence of the start or end offsets of a list of words, so that it can be binary searched.
+    '''
+
+    def __init__(self, words, attr):
+        self._words = words
+        self._attr = attr
+
+    def __getitem__(self, index):
+        return getattr(self._words[index], self._attr)
+
+    def __len__(self):
+        return len(self._words)
+
+
+class _TokenView(object):
+    '''
+    Read-only sequence of the tokens of a text given by their offsets, so that the multi-word expression
+    trie can be probed without slicing every token.
+    '''
+
+    def __init__(self, text, starts, ends):
+        self._text = text
+        self._starts = starts
+        self._ends = ends
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            text = self._text
+            return [text[start:end] for start, end in zip(self._starts[index], self._ends[index])]
+        return self._text[self._starts[index]:self._ends[index]]
+
+    def __len__(self):
+        return len(self._starts)
+
+
+# Flags of each code point for the NumPy engine, see _numpy_tokens().
+CHAR_RUSSIAN = 1
+CHAR_COMBINING = 2
+CHAR_DIGIT = 4
+CHAR_SPACE = 8
+CHAR_DECIMAL = 16
+CHAR_PUNCT = 32
+_char_flags = None
+
+
+def _numpy_char_flags():
+    '''
+    Returns an array of the flags of every code point, built on first use.
+    '''
+    global _char_flags
+    if _char_flags is None:
+        chars = ''.join(map(chr, range(sys.maxunicode + 1)))
+        flags = numpy.zeros(len(chars), dtype=numpy.uint8)
+        # The re module's \s and \d match exactly the characters of str.isspace() and str.isdecimal().
+        for flag, pattern in ((CHAR_SPACE, r'\s'), (CHAR_DECIMAL, r'\d')):
+            flags[[m.start() for m in re.finditer(pattern, chars)]] |= flag
+        for flag, members in ((CHAR_RUSSIAN, RUS_ALPHABET_STR), (CHAR_COMBINING, COMBINING_CHARS),
+                              (CHAR_DIGIT, string.digits), (CHAR_PUNCT, RUS_PUNCT + string.whitespace)):
+            flags[[ord(c) for c in members]] |= flag
+        _char_flags = flags
+    return _char_flags
+
+
+def _numpy_tokens(text):
+    '''
+    Splits text into the same tokens as RE_TOKEN_SPLIT, classifying them like `WordTokenizer._assemble()`,
+    but returns arrays of offsets instead of strings.
+
+    The flags of all characters are looked up at once, and tokens start wherever the class of character
+    changes between russian letters and combining marks, digits and any other characters. Tokens of other
+    characters are classified by counting the characters in each that lack a flag.
+
+    :param str text: non-empty normalized text
+    :return: tuple of (starts, ends, word_types, hyphens, russian) numpy arrays with one entry per token,
+             where `hyphens` marks tokens that are a single hyphen and `russian` tokens starting with a
+             russian letter
+    '''
+    codes = numpy.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+    flags = _numpy_char_flags()[codes]
+    classes = ((flags & (CHAR_RUSSIAN | CHAR_COMBINING)) != 0) * numpy.uint8(2) + ((flags & CHAR_DIGIT) != 0)
+    starts = numpy.concatenate(([0], numpy.flatnonzero(classes[1:] != classes[:-1]) + 1))
+    ends = numpy.append(starts[1:], len(text))
+
+    word_types = numpy.full(len(starts), Word.TYPE_UNDEFINED, dtype=numpy.uint8)
+    other = numpy.flatnonzero(classes[starts] == 0)
+    other_starts = starts[other]
+    other_ends = ends[other]
+    for flag, word_type in ((CHAR_PUNCT, Word.TYPE_PUNCT), (CHAR_DECIMAL, Word.TYPE_NUMERIC),
+                            (CHAR_SPACE, Word.TYPE_WHITESPACE)):
+        missing = numpy.concatenate(([0], numpy.cumsum((flags & flag) == 0, dtype=numpy.int64)))
+        word_types[other[missing[other_ends] == missing[other_starts]]] = word_type
+    first = flags[starts]
+    russian = (first & CHAR_RUSSIAN) != 0
+    word_types[russian] = Word.TYPE_WORD
+    word_types[(first & CHAR_DIGIT) != 0] = Word.TYPE_NUMERIC
+    hyphens = (ends - starts == 1) & (codes[starts] == ord(HYPHEN_CHAR))
+    return starts, ends, word_types, hyphens, russian
+
+
 class WordTokenizer(object):
     def __init__(self, **kwargs):
         '''
@@ -126,9 +686,153 @@ class WordTokenizer(object):
 
         Keyword Args:
            case_sensitive (bool): Match case of MWEs (default False)
+           mwes (iterable): Multi-word expressions to bulk load (default None)
+           lexicon (str): Path of a compiled lexicon to open, see `save_lexicon()` (default None)
+           cache_size (int): Cache the results of up to this many texts (default None, no cache)
+           cache_bytes (int): Cache results up to this approximate total size in bytes (default None, no cache)
+           engine (str): Character classification engine of compact tokenization and `encode()`: 'python',
+                         'numpy' or 'auto' to use NumPy for large texts when it is installed (default 'auto')
+           profile (bool): Record the wall time and counts of each pipeline stage in `stats` (default False)
+           hooks (iterable): Callables called as hook(stage, seconds, count) after each pipeline stage, e.g. to
+                             forward metrics; implies `profile` (default None)
         '''
-        self._mwes = []
-        self._case_sensitive = kwargs.get('case_sensitive', False)
+        engine = kwargs.get('engine', 'auto')
+        if engine not in ENGINES:
+            raise ValueError("engine must be one of %s: %r" % (', '.join(ENGINES), engine))
+        if engine == 'numpy' and numpy is None:
+            raise ImportError("NumPy is required for engine='numpy'")
+        self.engine = engine
+        self._lexicon_version = 0
+        self._cache = None
+        self._cache_version = 0
+        self._inner_keys = None
+        self._inner_keys_version = 0
+        if kwargs.get('cache_size') is not None or kwargs.get('cache_bytes') is not None:
+            self._cache = LRUCache(max_entries=kwargs.get('cache_size'), max_bytes=kwargs.get('cache_bytes'))
+        if kwargs.get('lexicon') is not None:
+            self._mwe_trie = CompiledMWETrie.open(kwargs['lexicon'])
+            if self._mwe_trie.case_sensitive != kwargs.get('case_sensitive', self._mwe_trie.case_sensitive):
+                raise ValueError("case_sensitive does not match the compiled lexicon: %s" % kwargs['lexicon'])
+            self._case_sensitive = self._mwe_trie.case_sensitive
+        else:
+            self._case_sensitive = kwargs.get('case_sensitive', False)
+            self._mwe_trie = MWETrie(case_sensitive=self._case_sensitive)
+        if kwargs.get('mwes') is not None:
+            self.add_mwes(kwargs['mwes'])
+        self.stats = None
+        self._hooks = []
+        if kwargs.get('profile') or kwargs.get('hooks'):
+            self.enable_profiling(kwargs.get('hooks') or ())
+
+    def enable_profiling(self, hooks=()):
+        '''
+        Starts recording the wall time and output counts of each pipeline stage (see
+        `pyrusbasic.stats.STAGES`) in `stats`, and calling the hooks after each stage.
+
+        The stages are replaced by timed versions on this instance only, so a tokenizer that is not
+        profiled runs no extra code at all. Loading multi-word expressions, `split()` and
+        `retokenize()` call the class methods directly and are not recorded. Profiling is not copied
+        when the tokenizer is pickled, e.g. to the worker processes of `tokenize_many()`.
+
+        :param iterable hooks: callables called as hook(stage, seconds, count)
+        :return: the TokenizerStats instance
+        '''
+        self._hooks.extend(hooks)
+        if self.stats is None:
+            self.stats = TokenizerStats()
+            self._instrument()
+        return self.stats
+
+    def disable_profiling(self):
+        '''
+        Stops recording stats and removes all hooks.
+        '''
+        for name in PROFILED_METHODS:
+            self.__dict__.pop(name, None)
+        self.stats = None
+        self._hooks = []
+
+    def _record(self, stage, seconds, count):
+        self.stats.record(stage, seconds, count)
+        for hook in self._hooks:
+            hook(stage, seconds, count)
+
+    def _record_mwes(self, word_types):
+        # Every russian word is looked up in the trie, and those typed as MWEs matched an expression.
+        if len(self._mwe_trie) > 0:
+            hits = word_types.count(Word.TYPE_MWE)
+            misses = word_types.count(Word.TYPE_WORD) + word_types.count(Word.TYPE_HYPHENATED_WORD)
+            self.stats.mwe_hits += hits
+            self.stats.mwe_probes += hits + misses
+
+    def _instrument(self):
+        '''
+        Shadows the pipeline methods with versions that time each call and record the size of its output.
+        '''
+        perf_counter = time.perf_counter
+        record = self._record
+        preprocess, tokenize, assemble, assemble_numpy, build_words, build_spans, build_ids = [
+            getattr(self, name) for name in PROFILED_METHODS]
+
+        def _preprocess(text):
+            started = perf_counter()
+            result = preprocess(text)
+            record('preprocess', perf_counter() - started, len(result))
+            return result
+
+        def _tokenize(text):
+            started = perf_counter()
+            result = tokenize(text)
+            record('tokenize', perf_counter() - started, len(result))
+            return result
+
+        def _assemble(tokens, word_types, word_sizes, stop=None):
+            count = len(word_types)
+            started = perf_counter()
+            result = assemble(tokens, word_types, word_sizes, stop)
+            seconds = perf_counter() - started
+            self._record_mwes(word_types[count:])
+            record('assemble', seconds, len(word_types) - count)
+            return result
+
+        def _assemble_numpy(text, final=True):
+            started = perf_counter()
+            result = assemble_numpy(text, final)
+            seconds = perf_counter() - started
+            if result is not None:
+                self._record_mwes(result[0].tolist())
+            record('assemble', seconds, 0 if result is None else len(result[0]))
+            return result
+
+        def _words(tokens, word_types, word_sizes, words, offset=0):
+            started = perf_counter()
+            result = build_words(tokens, word_types, word_sizes, words, offset)
+            record('build', perf_counter() - started, len(word_sizes))
+            return result
+
+        def _spans(tokens, word_types, word_sizes, wordlist, offset=0):
+            started = perf_counter()
+            result = build_spans(tokens, word_types, word_sizes, wordlist, offset)
+            record('build', perf_counter() - started, len(word_sizes))
+            return result
+
+        def _ids(tokens, word_sizes, vocabulary, ids):
+            started = perf_counter()
+            build_ids(tokens, word_sizes, vocabulary, ids)
+            record('build', perf_counter() - started, len(word_sizes))
+
+        for name, method in zip(PROFILED_METHODS, (_preprocess, _tokenize, _assemble, _assemble_numpy, _words,
+                                                   _spans, _ids)):
+            setattr(self, name, method)
+
+    def __getstate__(self):
+        # The timed methods are closures over this instance, so profiling is left out.
+        state = self.__dict__.copy()
+        for name in PROFILED_METHODS:
+            state.pop(name, None)
+        state['stats'] = None
+        state['_hooks'] = []
+        return state
 
     def add_mwe(self, mwe):
         '''
@@ -136,42 +840,583 @@ class WordTokenizer(object):
 
         :param str mwe: a multi word expression
         '''
-        if not self._case_sensitive:
-            mwe = mwe.lower()
-        bisect.insort(self._mwes, mwe)
+        # Not part of the tokenizer pipeline: call the class methods, which are never timed by profiling.
+        cls = type(self)
+        tokens = cls._tokenize(self, cls._preprocess(self, mwe))
+        self._mutable_mwe_trie().add(tokens)
+        self._lexicon_version += 1
 
     def add_mwes(self, mwes):
         '''
-        Adds a list of multi-word expressions.
+        Adds a list of multi-word expressions in a single pass. Expressions are normalized and duplicates are
+        skipped before they are tokenized, so loading time is linear in the size of the lexicon.
 
         :param list mwe: a list of strings to treat as multi-word expressions
+        :return: MWELoadResult with the number of expressions added and skipped as duplicates, the size of
+                 the index (expressions and trie nodes) and the load time in seconds
         '''
+        started = time.perf_counter()
+        cls = type(self)
+        trie = self._mutable_mwe_trie()
+        seen = set()
+        added = duplicates = 0
         for mwe in mwes:
-            self.add_mwe(mwe)
+            text = cls._preprocess(self, mwe)
+            if not self._case_sensitive:
+                text = text.lower()
+            if text in seen:
+                duplicates += 1
+                continue
+            seen.add(text)
+            if trie.add(cls._tokenize(self, text)):
+                added += 1
+            else:
+                duplicates += 1
+        if added > 0:
+            self._lexicon_version += 1
+        return MWELoadResult(
+            added=added,
+            duplicates=duplicates,
+            size=len(trie),
+            nodes=trie.node_count,
+            seconds=time.perf_counter() - started,
+        )
 
-    def tokenize(self, text):
+    def save_lexicon(self, path):
+        '''
+        Compiles the multi-word expressions and the settings that affect matching into a versioned binary
+        file. Passing the file as the `lexicon` keyword argument memory-maps it, so that worker processes
+        share one read-only copy instead of each rebuilding the lexicon.
+
+        :param str path: output file path
+        '''
+        self._mwe_trie.save(path)
+
+    @classmethod
+    def from_lexicon(cls, path, **kwargs):
+        '''
+        Returns a tokenizer that uses a compiled lexicon written by `save_lexicon()`.
+
+        :param str path: compiled lexicon file path
+        :param kwargs: Keyword args passed to the constructor
+        :return: WordTokenizer instance
+        '''
+        return cls(lexicon=path, **kwargs)
+
+    def _mutable_mwe_trie(self):
+        '''
+        Returns the MWE trie, first copying a memory-mapped lexicon into memory so that it can be extended.
+        '''
+        if isinstance(self._mwe_trie, CompiledMWETrie):
+            compiled = self._mwe_trie
+            self._mwe_trie = compiled.to_trie()
+            compiled.close()
+        return self._mwe_trie
+
+    def tokenize(self, text, compact=False):
         '''
         Parse the input text, returning a list of Word objects.
 
+        In compact mode the words are stored as columns of types and offsets into the normalized text, and
+        Word objects are only created when they are asked for. This takes a fraction of the memory for large
+        texts.
+
+        If the tokenizer was created with a cache, results are cached by text. Every call still returns a
+        new WordList, so callers may modify it freely.
+
         :param str text: input text to parse
+        :param bool compact: return a ColumnarWordList of span-based words (default False)
         :return: WordList object
         '''
+        if self._cache is not None:
+            return self._tokenize_cached(text, compact)
         normalized_text = self._preprocess(text)
+        if compact:
+            return self._tokenize_compact(normalized_text)
         tokens = self._tokenize(normalized_text)
         words = self._process(tokens)
-        return WordList(words)
+        return WordList(words, text=normalized_text)
+
+    def _tokenize_compact(self, normalized_text):
+        wordlist = ColumnarWordList(normalized_text)
+        if self._use_numpy(normalized_text):
+            for word_types, starts, ends in self._scan_numpy(normalized_text):
+                wordlist.types.frombytes(word_types.tobytes())
+                wordlist.starts.frombytes(starts.astype(numpy.int64).tobytes())
+                wordlist.ends.frombytes(ends.astype(numpy.int64).tobytes())
+            return wordlist
+        blocks = (normalized_text[i:i + SCAN_BLOCK_SIZE] for i in range(0, len(normalized_text), SCAN_BLOCK_SIZE))
+        offset = 0
+        for tokens, word_types, word_sizes in self._scan(blocks):
+            offset = self._spans(tokens, word_types, word_sizes, wordlist, offset)
+        return wordlist
+
+    def _tokenize_cached(self, text, compact):
+        '''
+        Tokenizes through the result cache. The cache holds the tokens and word types and sizes, or the
+        columns of a ColumnarWordList, which are never handed out: a new WordList is built from them on
+        every call. The cache is cleared whenever the multi-word expressions change.
+        '''
+        if self._cache_version != self._lexicon_version:
+            self._cache.clear()
+            self._cache_version = self._lexicon_version
+        key = (compact, text)
+        entry = self._cache.get(key)
+        if self.stats is not None:
+            self._record('cache', 0.0, int(entry is not None))
+        if entry is None:
+            normalized_text = self._preprocess(text)
+            if compact:
+                entry = self._tokenize_compact(normalized_text)
+                size = sys.getsizeof(normalized_text) + 17 * len(entry)
+            else:
+                tokens = self._tokenize(normalized_text)
+                word_types = []
+                word_sizes = []
+                self._assemble(tokens, word_types, word_sizes)
+                entry = (normalized_text, tokens, word_types, word_sizes)
+                size = sys.getsizeof(normalized_text) + 64 * len(tokens) + 16 * len(word_types)
+            if normalized_text is not text:
+                size += sys.getsizeof(text)
+            self._cache.put(key, entry, size)
+        if compact:
+            return ColumnarWordList(entry.text, array.array('B', entry.types), array.array('q', entry.starts),
+                                    array.array('q', entry.ends))
+        normalized_text, tokens, word_types, word_sizes = entry
+        words = []
+        self._words(tokens, word_types, word_sizes, words)
+        return WordList(words, text=normalized_text)
+
+    def cache_info(self):
+        '''
+        Returns statistics of the result cache.
+
+        :return: CacheInfo with hits, misses, entries, bytes, max_entries and max_bytes, or None if the
+                 tokenizer has no cache
+        '''
+        if self._cache is None:
+            return None
+        return self._cache.info()
+
+    def cache_clear(self):
+        '''
+        Removes all cached results.
+        '''
+        if self._cache is not None:
+            self._cache.clear()
+
+    def encode(self, text, vocabulary):
+        '''
+        Parse the input text into integer word ids, without creating Word objects.
+
+        Each word is looked up in the vocabulary by its text and added to it if it is missing, so that the
+        same vocabulary can be grown over a corpus and saved. `vocabulary.decode(ids)` returns the text.
+
+        :param str text: input text to parse
+        :param Vocabulary vocabulary: the vocabulary that maps words to ids
+        :return: tuple of (array of word ids, array of word types) with one entry per word
+        '''
+        ids = array.array('I')
+        types = array.array('B')
+        normalized_text = self._preprocess(text)
+        if self._use_numpy(normalized_text):
+            add_raw = vocabulary._add_raw
+            for word_types, starts, ends in self._scan_numpy(normalized_text):
+                ids.extend([add_raw(normalized_text[start:end]) for start, end in zip(starts.tolist(), ends.tolist())])
+                types.frombytes(word_types.tobytes())
+            return ids, types
+        blocks = (normalized_text[i:i + SCAN_BLOCK_SIZE] for i in range(0, len(normalized_text), SCAN_BLOCK_SIZE))
+        for tokens, word_types, word_sizes in self._scan(blocks):
+            self._ids(tokens, word_sizes, vocabulary, ids)
+            types.extend(word_types)
+        return ids, types
+
+    def _use_numpy(self, text):
+        if self.engine == 'auto':
+            return numpy is not None and len(text) >= NUMPY_MIN_LENGTH
+        return self.engine == 'numpy'
+
+    def _scan_numpy(self, text):
+        '''
+        Tokenizes and groups normalized text with the NumPy engine, block by block (see `_scan()`). Each
+        block is re-scanned from the first token that was not grouped into a word.
+
+        :param str text: normalized text
+        :return: generator of (word_types, starts, ends) numpy arrays for each run of complete words
+        '''
+        position = 0
+        length = len(text)
+        size = NUMPY_BLOCK_SIZE
+        while position < length:
+            block_end = min(position + size, length)
+            result = self._assemble_numpy(text[position:block_end], final=block_end == length)
+            if result is None:
+                # Not enough tokens in the block for the lookahead.
+                size *= 2
+                continue
+            word_types, starts, ends, consumed = result
+            yield word_types, starts + position, ends + position
+            position += consumed
+            size = NUMPY_BLOCK_SIZE
+
+    def _assemble_numpy(self, text, final=True):
+        '''
+        Classifies and groups the tokens of a block of text into words, like `_assemble()`, from the token
+        offsets and types computed by `_numpy_tokens()`.
+
+        Only tokens that can start a hyphenated word or a multi-word expression are visited one by one: the
+        russian words followed by a hyphen, or all russian words if there are multi-word expressions. Every
+        other token is a word on its own.
+
+        :param str text: non-empty normalized text
+        :param bool final: the block ends the text, otherwise words are only started at tokens that leave
+                           enough lookahead tokens in the block
+        :return: tuple of (word_types, starts, ends, consumed) where `consumed` is the offset of the end of
+                 the last word, or None if the block is too short to start any word
+        '''
+        starts, ends, word_types, hyphens, russian = _numpy_tokens(text)
+        end = len(starts)
+        stop = end if final else end - max(3, self._mwe_trie.max_length)
+        if stop <= 0:
+            return None
+        trie = self._mwe_trie if len(self._mwe_trie) > 0 else None
+        if trie is not None:
+            candidates = russian[:stop]
+        else:
+            candidates = russian[:stop] & numpy.append(hyphens[1:], False)[:stop]
+        token_starts = starts.tolist()
+        token_ends = ends.tolist()
+        tokens = _TokenView(text, token_starts, token_ends)
+        grouped = numpy.zeros(end, dtype=bool)
+        is_hyphen = hyphens.tolist()
+        is_russian = russian.tolist()
+        # Whether any multi-word expression begins with a token, memoized by token.
+        probes = {}
+        index = 0
+        for start in numpy.flatnonzero(candidates).tolist():
+            if start < index:
+                continue
+            index = start + 1
+            word_type = Word.TYPE_WORD
+            if index < end and is_hyphen[index]:
+                word_type = Word.TYPE_HYPHENATED_WORD
+                index += 1
+                if index < end and is_russian[index]:
+                    index += 1
+            if trie is not None:
+                if index - start == 1:
+                    token = text[token_starts[start]:token_ends[start]]
+                    probe = probes.get(token)
+                    if probe is None:
+                        probe = probes[token] = trie.starts_with(token)
+                    if not probe:
+                        continue
+                found = trie.longest_match(tokens[start:index], tokens, index)
+                if found > 0:
+                    word_type = Word.TYPE_MWE
+                    index += found
+            if index - start > 1:
+                grouped[start + 1:index] = True
+                word_types[start] = word_type
+        stop = max(stop, index)
+        first = numpy.flatnonzero(~grouped[:stop])
+        word_starts = starts[first]
+        word_ends = numpy.append(word_starts[1:], ends[stop - 1])
+        return word_types[first], word_starts, word_ends, int(ends[stop - 1])
+
+    def tokenize_iter(self, source, chunk_size=65536):
+        '''
+        Parse text read incrementally from a file-like object or an iterable of string chunks, yielding
+        Word objects as soon as they are complete.
+
+        Only a small lookahead buffer is kept between chunks: the last few tokens, enough to group the
+        longest multi-word expression or a hyphenated word, plus any trailing characters that combining
+        marks in the next chunk could still attach to. Memory use is therefore bounded by the chunk size
+        rather than by the size of the text, and the words are the same as those returned by `tokenize()`.
+
+        :param source: a file-like object opened in text mode, an iterable of strings, or a string
+        :param int chunk_size: number of characters to read at a time from a file-like object
+        :return: generator of Word objects
+        '''
+        if isinstance(source, str):
+            chunks = [source]
+        elif hasattr(source, 'read'):
+            chunks = iter(lambda: source.read(chunk_size), '')
+        else:
+            chunks = source
+        offset = 0
+        for tokens, word_types, word_sizes in self._scan(self._preprocess_chunks(chunks)):
+            words = []
+            offset = self._words(tokens, word_types, word_sizes, words, offset)
+            yield from words
+
+    def _preprocess_chunks(self, chunks):
+        '''
+        Preprocess text chunk by chunk (see `_preprocess()`).
+
+        The last character that is not a combining mark, and any marks that follow it, are held back until
+        the next chunk, since marks at the start of the next chunk belong to it.
+
+        :param chunks: iterable of strings
+        :return: generator of normalized strings
+        '''
+        pending = ''
+        for chunk in chunks:
+            pending += chunk
+            cut = len(pending) - 1
+            while cut >= 0 and unicodedata.combining(pending[cut]):
+                cut -= 1
+            if cut > 0:
+                yield self._preprocess(pending[:cut])
+                pending = pending[cut:]
+        if pending:
+            yield self._preprocess(pending)
+
+    def _scan(self, chunks):
+        '''
+        Tokenizes and groups normalized text chunk by chunk, keeping only a small lookahead buffer of tokens
+        between chunks.
+
+        The last token of a chunk may continue in the next one, and a word may extend up to the length of
+        the longest multi-word expression (or three tokens for a hyphenated word), so words are only started
+        at tokens that leave that many tokens of lookahead. The remaining tokens are carried over.
+
+        :param chunks: iterable of normalized strings
+        :return: generator of (tokens, word_types, word_sizes) for each run of complete words, where
+                 `word_sizes` is the number of tokens in each word
+        '''
+        lookahead = max(3, self._mwe_trie.max_length)
+        tail = ''
+        for chunk in chunks:
+            tokens = self._tokenize(tail + chunk)
+            word_types = []
+            word_sizes = []
+            index = self._assemble(tokens, word_types, word_sizes, stop=len(tokens) - lookahead)
+            tail = ''.join(tokens[index:])
+            yield tokens, word_types, word_sizes
+        tokens = self._tokenize(tail)
+        word_types = []
+        word_sizes = []
+        self._assemble(tokens, word_types, word_sizes)
+        yield tokens, word_types, word_sizes
+
+    def tokenize_many(self, texts, workers=None, chunksize=64, ordered=True, return_exceptions=False):
+        '''
+        Parse many independent texts in parallel with a pool of worker processes. The tokenizer settings
+        and multi-word expressions are sent to each worker once, not with every text.
+
+        :param texts: iterable of strings
+        :param int workers: number of worker processes (default os.cpu_count()), 1 parses in this process
+        :param int chunksize: number of texts sent to a worker at a time
+        :param bool ordered: yield WordLists in input order, otherwise yield (index, WordList) pairs as
+                             they complete
+        :param bool return_exceptions: yield the exception raised by a text in place of its WordList,
+                                       otherwise re-raise it
+        :return: generator of WordList objects or (index, WordList) pairs
+        '''
+        return parallel.tokenize_many(self, texts, workers=workers, chunksize=chunksize, ordered=ordered,
+                                      return_exceptions=return_exceptions)
+
+    def split(self, text, min_length=0):
+        '''
+        Splits text into pieces that can be tokenized independently: joining the results with
+        `WordList.concatenate()` gives the same words as tokenizing the whole text.
+
+        Pieces end after a run of punctuation and whitespace that contains a sentence end followed by
+        whitespace or a line break, such as '. ', '?» ' or '\\n\\n'. The whole run is kept in the piece, including
+        any opening quote of the next sentence. A cut is skipped if the run is a token that some multi-word
+        expression continues after, so that it never falls inside a hyphenated word or a multi-word expression.
+
+        :param str text: input text
+        :param int min_length: join consecutive sentences into pieces of at least this many characters
+                               (default 0, one piece per sentence)
+        :return: list of pieces of the normalized text
+        '''
+        cls = type(self)
+        normalized_text = cls._preprocess(self, text)
+        trie = self._mwe_trie
+        inner_keys = self._split_inner_keys()
+        pieces = []
+        start = 0
+        for match in RE_SENTENCE_END.finditer(normalized_text):
+            end = match.end()
+            if end - start < min_length:
+                continue
+            if inner_keys and trie.key(match.group()) in inner_keys:
+                continue
+            pieces.append(normalized_text[start:end])
+            start = end
+        if start < len(normalized_text):
+            pieces.append(normalized_text[start:])
+        return pieces
+
+    def _split_inner_keys(self):
+        '''
+        Returns the keys of the tokens that some multi-word expression continues after (see
+        `MWETrie.inner_keys()`), computed once per change to the multi-word expressions rather than
+        on every call to `split()`.
+        '''
+        if self._inner_keys is None or self._inner_keys_version != self._lexicon_version:
+            trie = self._mwe_trie
+            self._inner_keys = trie.inner_keys() if len(trie) > 0 else frozenset()
+            self._inner_keys_version = self._lexicon_version
+        return self._inner_keys
+
+    def tokenize_parallel(self, text, workers=None, min_length=SPLIT_LENGTH):
+        '''
+        Parse a single large text with a pool of worker processes, by splitting it at sentence ends (see
+        `split()`) and joining the results. The words are the same as those returned by `tokenize()`.
+
+        :param str text: input text to parse
+        :param int workers: number of worker processes (default os.cpu_count()), 1 parses in this process
+        :param int min_length: minimum length of the pieces sent to the workers
+        :return: WordList object
+        '''
+        pieces = self.split(text, min_length)
+        return WordList.concatenate(self.tokenize_many(pieces, workers=workers, chunksize=1))
+
+    def retokenize(self, wordlist, offset, removed, inserted):
+        '''
+        Updates the result of `tokenize()` after an edit to its text, re-scanning only the words around the
+        edit.
+
+        The re-scanned region starts enough words before the edit that no earlier word could have grouped
+        tokens from it (the length of the longest multi-word expression, or three tokens for a hyphenated
+        word), and extends past it until the new words line up again with the old ones. Words after that
+        point are reused from the previous result, which is updated in place and must not be used afterwards.
+
+        The offsets of the reused words are not shifted right away: the shift is recorded and applied to
+        the words between this edit and the next one when it is made, or to all of them when `words`,
+        `starts` or `ends` of the result is accessed. A series of edits near each other therefore takes time
+        proportional to the edits and the distance between them. The only work that depends on the size of
+        the document is copying the text and moving the words after the edit in memory.
+
+        :param WordList wordlist: previous result of `tokenize()`, either mode
+        :param int offset: offset of the edit in `wordlist.text`, the normalized text
+        :param int removed: number of characters removed at the offset
+        :param str inserted: text inserted at the offset
+        :return: tuple of the new WordList and a ChangedRange of word indexes
+        '''
+        text = wordlist.text
+        if text is None:
+            raise ValueError("WordList has no source text to edit")
+        if offset < 0 or removed < 0 or offset + removed > len(text):
+            raise ValueError("Edit out of range: offset %s, removed %s, text length %s" % (offset, removed, len(text)))
+        cls = type(self)
+        columnar = isinstance(wordlist, ColumnarWordList)
+        if columnar:
+            starts, ends = wordlist._starts, wordlist._ends
+        else:
+            starts, ends = _WordOffsets(wordlist._words, 'start'), _WordOffsets(wordlist._words, 'end')
+        shift_index, shift = wordlist._shift_index, wordlist._shift
+        if shift:
+            starts, ends = _ShiftedOffsets(starts, shift_index, shift), _ShiftedOffsets(ends, shift_index, shift)
+        count = len(starts)
+        context = max(3, self._mwe_trie.max_length)
+        edit_end = offset + removed
+
+        first = max(0, bisect.bisect_left(ends, offset) - context)
+        after = bisect.bisect_left(starts, edit_end)
+        region_start = starts[first] if first < count else 0
+        stop = after + 2 * context
+        if stop >= count:
+            stop = count
+            region_end = len(text)
+        else:
+            region_end = ends[stop - 1]
+
+        region = cls._preprocess(self, text[region_start:offset] + inserted + text[edit_end:region_end])
+        delta = len(region) - (region_end - region_start)
+        tokens = cls._tokenize(self, region)
+        word_types = []
+        word_sizes = []
+        cls._assemble(self, tokens, word_types, word_sizes)
+
+        # Find the first new word after the edit that starts where an old word started. Everything from
+        # there on is grouped exactly as before, provided enough of the old words were re-scanned after it.
+        resume = count
+        new_count = len(word_types)
+        if stop < count:
+            position = region_start
+            index = 0
+            old = after
+            for k, size in enumerate(word_sizes):
+                old_position = position - delta
+                if old_position >= edit_end:
+                    while old < count and starts[old] < old_position:
+                        old += 1
+                    if old >= after + context:
+                        break
+                    if starts[old] == old_position:
+                        resume = old
+                        new_count = k
+                        break
+                position += sum(map(len, tokens[index:index + size]))
+                index += size
+            if resume == count:
+                # The words did not line up again, so re-scan the rest of the text.
+                region = cls._preprocess(self, text[region_start:offset] + inserted + text[edit_end:])
+                delta = len(region) - (len(text) - region_start)
+                tokens = cls._tokenize(self, region)
+                word_types = []
+                word_sizes = []
+                cls._assemble(self, tokens, word_types, word_sizes)
+                new_count = len(word_types)
+                region_end = len(text)
+        else:
+            region_end = len(text)
+
+        new_text = text[:region_start] + region + text[region_end:]
+        changed = ChangedRange(first, resume, first + new_count)
+
+        # The reused words after the edit are shifted by the pending shift plus this edit's delta. Apply the
+        # pending shift to the words between its start and the edit, whose shift now differs from that.
+        if columnar:
+            shift_range = _shift_offsets
+            offsets = (wordlist._starts, wordlist._ends)
+        else:
+            shift_range = _shift_words
+            offsets = (wordlist._words,)
+        if shift:
+            for values in offsets:
+                if shift_index < first:
+                    shift_range(values, shift_index, first, shift)
+                elif shift_index > resume:
+                    shift_range(values, resume, shift_index, -shift)
+        if columnar:
+            words = ColumnarWordList(None)
+            cls._spans(self, tokens, word_types[:new_count], word_sizes[:new_count], words, region_start)
+            wordlist.types[first:resume] = words.types
+            wordlist._starts[first:resume] = words._starts
+            wordlist._ends[first:resume] = words._ends
+            result = ColumnarWordList(new_text, wordlist.types, wordlist._starts, wordlist._ends)
+        else:
+            words = []
+            cls._words(self, tokens, word_types[:new_count], word_sizes[:new_count], words, region_start)
+            wordlist._words[first:resume] = words
+            result = WordList(wordlist._words, text=new_text)
+        result._shift_index = first + new_count
+        result._shift = shift + delta
+        return result, changed
 
     def _preprocess(self, text):
         '''
         Preprocess the input text by normalizing hyphens and decomposing the unicode string is fully decomposed for
         easier parsing.
 
+        Input that is already normalized is returned as is, without copying it: ASCII text needs no changes
+        at all, and other text is checked with the Unicode normalization quick check before decomposing it.
+
         :param str text: the input text
         :return: output text in NFKD form
         '''
-        text = text.replace(EN_DASH_CHAR, HYPHEN_CHAR)
-        nfkd_form = unicodedata.normalize('NFKD', text)
-        return nfkd_form
+        if _isascii(text):
+            return text
+        if EN_DASH_CHAR in text:
+            text = text.replace(EN_DASH_CHAR, HYPHEN_CHAR)
+        if _is_normalized('NFKD', text):
+            return text
+        return unicodedata.normalize('NFKD', text)
 
     def _tokenize(self, text):
         '''
@@ -186,86 +1431,140 @@ class WordTokenizer(object):
         :param str text: the input text
         :return: a list of tokens or strings
         '''
-        COMBINING_CHARS = COMBINING_ACCENT_CHAR + COMBINING_BREVE_CHAR + COMBINING_DIURESIS_CHAR
-        pattern = "([0-9]+|[^0-9" + RUS_ALPHABET_STR + COMBINING_CHARS + "]+)"
-        tokens = re.split(pattern, text)
+        tokens = RE_TOKEN_SPLIT.split(text)
         tokens = [t for t in tokens if t != '']
         return tokens
 
     def _process(self, tokens):
         '''
         Processes the tokens by converting them to word objects, classifying their type, and grouping
-        hypheanted/multi-word expressions.
+        hyphenated/multi-word expressions.
 
         :param list tokens: the list of tokens
         :return: list of Word objects
         '''
-        tokenqueue = collections.deque(tokens)
+        word_types = []
+        word_sizes = []
+        self._assemble(tokens, word_types, word_sizes)
         words = []
-        while len(tokenqueue) > 0:
-            token = tokenqueue.popleft()
-            word = Word(token)
-            if token[0] in RUS_ALPHABET_SET:
-                word.word_type = Word.TYPE_WORD
-                self._process_hyphenated(tokenqueue, word)
-                self._process_mwes(tokenqueue, word)
-            elif RE_WHITESPACE_ONLY.match(token):
-                word.type = Word.TYPE_WHITESPACE
-            elif RE_DIGITS_ONLY.match(token):
-                word.type = Word.TYPE_NUMERIC
-            elif all(p in token for p in RUS_PUNCT):
-                word.type = Word.TYPE_PUNCT
-            words.append(word)
+        self._words(tokens, word_types, word_sizes, words)
         return words
 
-    def _process_hyphenated(self, tokenqueue, word):
+    def _assemble(self, tokens, word_types, word_sizes, stop=None):
+        '''
+        Classifies and groups the tokens into words, appending the type and number of tokens of each word.
+
+        This is a single pass over the token list: the type of each token is looked up from its first
+        character and hyphenated words and multi-word expressions are grouped by looking ahead in the list.
+
+        :param list tokens: the list of tokens
+        :param list word_types: list that the type of each word is appended to
+        :param list word_sizes: list that the number of tokens in each word is appended to
+        :param int stop: only start new words at token indexes before `stop` (default all tokens)
+        :return: index of the first token that was not grouped into a word
+        '''
+        trie = self._mwe_trie if len(self._mwe_trie) > 0 else None
+        append_type = word_types.append
+        append_size = word_sizes.append
+        end = len(tokens)
+        if stop is None:
+            stop = end
+        index = 0
+        while index < stop:
+            token = tokens[index]
+            start = index
+            index += 1
+            word_type = TOKEN_CLASSES.get(token[0])
+            if word_type == Word.TYPE_WORD:
+                if index < end and tokens[index] == HYPHEN_CHAR:
+                    word_type = Word.TYPE_HYPHENATED_WORD
+                    index += 1
+                    if index < end and tokens[index][0] in RUS_ALPHABET_SET:
+                        index += 1
+                if trie is not None:
+                    found = trie.longest_match(tokens[start:index], tokens, index)
+                    if found > 0:
+                        word_type = Word.TYPE_MWE
+                        index += found
+            elif word_type is not None:
+                pass
+            elif token.isspace():
+                word_type = Word.TYPE_WHITESPACE
+            elif token.isdecimal():
+                word_type = Word.TYPE_NUMERIC
+            elif not token.translate(TRANSLATOR_PUNCT_WHITESPACE_REMOVE):
+                word_type = Word.TYPE_PUNCT
+            else:
+                word_type = Word.TYPE_UNDEFINED
+            append_type(word_type)
+            append_size(index - start)
+        return index
+
+    def _words(self, tokens, word_types, word_sizes, words, offset=0):
+        '''
+        Creates Word objects from the output of `_assemble()` and appends them to `words`.
+
+        :param list tokens: the list of tokens
+        :param list word_types: the type of each word
+        :param list word_sizes: the number of tokens in each word
+        :param list words: list that Word objects are appended to
+        :param int offset: offset of the first token in the normalized text
+        :return: offset of the end of the last word
         '''
-        Group hyphenated tokens together in the same word.
+        append = words.append
+        index = 0
+        for word_type, size in zip(word_types, word_sizes):
+            if size == 1:
+                word_tokens = [tokens[index]]
+                end = offset + len(word_tokens[0])
+            else:
+                word_tokens = tokens[index:index + size]
+                end = offset + sum(map(len, word_tokens))
+            append(Word(word_tokens, word_type, offset, end))
+            index += size
+            offset = end
+        return offset
 
-        :param tokenqueue: a queue of tokens
-        :param word: Word object to be augmented
-        :return: True if hyphenated word identified, False otherwise
+    def _spans(self, tokens, word_types, word_sizes, wordlist, offset=0):
         '''
-        found_hyphen = len(tokenqueue) > 0 and tokenqueue[0] == HYPHEN_CHAR
-        if found_hyphen:
-            word.type = Word.TYPE_HYPHENATED_WORD
-            word.tokens.append(tokenqueue.popleft())
-            if len(tokenqueue) > 0 and tokenqueue[0][0] in RUS_ALPHABET_SET:
-                word.tokens.append(tokenqueue.popleft())
-        return found_hyphen
+        Appends the output of `_assemble()` to the columns of a ColumnarWordList.
 
-    def _process_mwes(self, tokenqueue, word):
+        :param list tokens: the list of tokens
+        :param list word_types: the type of each word
+        :param list word_sizes: the number of tokens in each word
+        :param ColumnarWordList wordlist: the word list to extend
+        :param int offset: offset of the first token in the normalized text
+        :return: offset of the end of the last word
         '''
-        Group tokens that form the longest multi-word expression in the same word.
+        starts = wordlist.starts
+        ends = wordlist.ends
+        index = 0
+        for size in word_sizes:
+            starts.append(offset)
+            if size == 1:
+                offset += len(tokens[index])
+            else:
+                offset += sum(map(len, tokens[index:index + size]))
+            ends.append(offset)
+            index += size
+        wordlist.types.extend(word_types)
+        return offset
 
-        Note: assumes sorted list of MWEs for binary search.
-        Todo: a Trie data structure would be more efficient here.
+    def _ids(self, tokens, word_sizes, vocabulary, ids):
+        '''
+        Appends the vocabulary id of each word in the output of `_assemble()` to `ids`.
 
-        :param tokenqueue: a queue of tokens
-        :param word: Word object to be augmented
-        :return: True if MWE identified, False otherwise
+        :param list tokens: the list of tokens
+        :param list word_sizes: the number of tokens in each word
+        :param Vocabulary vocabulary: the vocabulary that maps words to ids
+        :param array ids: the array of ids to extend
         '''
-        if len(self._mwes) == 0:
-            return False
-        w = word.copy()
-        found_pos = found_index = -1
-        pos = index = 0
-        while index < len(tokenqueue):
-            w.tokens.append(tokenqueue[index])
-            expr = w.gettext(remove_accents=True)
-            if not self._case_sensitive:
-                expr = expr.lower()
-            pos = bisect.bisect_left(self._mwes, expr, pos)
-            if pos >= len(self._mwes) or len(expr) > len(self._mwes[pos]):
-                break
-            if self._mwes[pos] == expr:
-                found_pos = pos
-                found_index = index
-            if self._mwes[pos].startswith(expr):
-                index += 1
+        add_raw = vocabulary._add_raw
+        append = ids.append
+        index = 0
+        for size in word_sizes:
+            if size == 1:
+                append(add_raw(tokens[index]))
             else:
-                break
-        while found_index >= 0:
-            word.tokens.append(tokenqueue.popleft())
-            found_index -= 1
-        return found_pos >= 0
+                append(add_raw(''.join(tokens[index:index + size])))
+            index += size
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import json
+import unicodedata
+
+VOCABULARY_VERSION = 1
+
+
+class Vocabulary(object):
+    '''
+    Growable mapping between word strings and integer ids, for encoding tokenized text as arrays of ids.
+
+    Each distinct word string is stored once. Words are looked up by their text in the normalized input
+    first, so that the NFKC form of each distinct string is only computed the first time it is seen.
+    '''
+
+    def __init__(self, words=(), unknown=None):
+        '''
+        :param iterable words: initial words, given ids in order
+        :param str unknown: word used for words that are missing once the vocabulary is frozen (default
+                            None, missing words raise KeyError)
+        '''
+        self.frozen = False
+        self.unknown = unknown
+        self._words = []
+        self._ids = {}
+        self._raw = {}
+        if unknown is not None:
+            self.add(unknown)
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        '''
+        Returns the id of a word, adding it if it is missing and the vocabulary is not frozen.
+
+        :param str word: the word string, in NFKC form as returned by `str(word)`
+        :return: the word id
+        '''
+        word_id = self._ids.get(word)
+        if word_id is None:
+            if self.frozen:
+                if self.unknown is None:
+                    raise KeyError(word)
+                return self._ids[self.unknown]
+            word_id = self._ids[word] = len(self._words)
+            self._words.append(word)
+        return word_id
+
+    def _add_raw(self, raw):
+        # Looks up a word by its text in the normalized (NFKD) input.
+        word_id = self._raw.get(raw)
+        if word_id is None:
+            word = unicodedata.normalize('NFKC', raw)
+            word_id = self.add(word)
+            if word in self._ids:
+                self._raw[raw] = word_id
+        return word_id
+
+    def freeze(self):
+        '''
+        Stops adding new words: missing words map to the unknown word, or raise KeyError.
+        '''
+        self.frozen = True
+
+    def get(self, word, default=None):
+        '''
+        :param str word: the word string
+        :param default: value returned if the word is missing
+        :return: the word id, or `default`
+        '''
+        return self._ids.get(word, default)
+
+    def decode(self, ids):
+        '''
+        Returns the text of a sequence of ids.
+
+        :param ids: sequence of word ids
+        :return: the concatenated words
+        '''
+        words = self._words
+        return ''.join([words[i] for i in ids])
+
+    def save(self, path):
+        '''
+        Writes the vocabulary to a JSON file.
+
+        :param str path: output file path
+        '''
+        data = {'version': VOCABULARY_VERSION, 'words': self._words, 'unknown': self.unknown, 'frozen': self.frozen}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Reads a vocabulary written by `save()`.
+
+        :param str path: vocabulary file path
+        :return: Vocabulary instance
+        '''
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != VOCABULARY_VERSION:
+            raise ValueError("Unsupported vocabulary version %s (expected %s): %s"
+                             % (data.get('version'), VOCABULARY_VERSION, path))
+        vocabulary = cls()
+        vocabulary.unknown = data['unknown']
+        for word in data['words']:
+            vocabulary.add(word)
+        vocabulary.frozen = data['frozen']
+        return vocabulary
+
+    def __getitem__(self, word_id):
+        return self._words[word_id]
+
+    def __contains__(self, word):
+        return word in self._ids
+
+    def __len__(self):
+        return len(self._words)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_raw'] = {}
+        return state
+
+    def __repr__(self):
+        return "Vocabulary(%s)" % len(self._words)
@@ -10,4 +10,6 @@ setup(
     long_description_content_type='text/markdown',
     python_requires='>3.5.2',
     install_requires=[],
+    extras_require={'numpy': ['numpy']},
+    entry_points={'console_scripts': ['pyrusbasic = pyrusbasic.cli:main']},
 )